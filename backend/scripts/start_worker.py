@@ -11,8 +11,9 @@ import asyncio
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.services.worker_service import main
+from src.services.worker_service import install_event_loop, main
 
 if __name__ == "__main__":
     print("Starting MAX Flowstudio Worker Service...")
+    install_event_loop()
     asyncio.run(main())
\ No newline at end of file
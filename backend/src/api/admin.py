@@ -24,6 +24,7 @@ from src.models.workspace_mapping import (
     WorkspacePermissionLevel
 )
 from src.services.group_sync_service import group_sync_service, sync_groups_from_auth_server
+from src.services.permission_cache import invalidate_group, invalidate_user
 from src.config.settings import get_settings
 import structlog
 
@@ -490,6 +491,7 @@ async def delete_group(
     # 그룹 삭제 (CASCADE로 관련 매핑들도 자동 삭제됨)
     await db.delete(group)
     await db.commit()
+    invalidate_group(str(group.id))
     
     return {"message": "Group deleted successfully"}
 
@@ -530,6 +532,7 @@ async def assign_user_to_group(
     user.updated_at = datetime.utcnow()
     
     await db.commit()
+    invalidate_user(user_id)
     
     return {"message": f"User {user.username} assigned to group {group.name}"}
 
@@ -559,6 +562,7 @@ async def remove_user_from_group(
     user.updated_at = datetime.utcnow()
     
     await db.commit()
+    invalidate_user(user_id)
     
     return {"message": f"User {user.username} removed from group"}
 
@@ -18,6 +18,7 @@ from src.models.workspace import WorkspaceType
 from src.models.workspace_permission import PermissionType
 from src.models.user import User
 from src.services.workspace_service import workspace_service
+from src.services.permission_cache import invalidate_workspace
 
 logger = structlog.get_logger(__name__)
 router = APIRouter(prefix="/api/workspaces", tags=["workspaces"])
@@ -468,6 +469,7 @@ async def assign_workspace_permission(
             db.add(new_mapping)
         
         await db.commit()
+        invalidate_workspace(workspace_id)
         
         return {
             "message": f"User permission {assignment.permission_level.value} assigned successfully",
@@ -575,6 +577,7 @@ async def assign_workspace_permission(
             db.add(new_mapping)
         
         await db.commit()
+        invalidate_workspace(workspace_id)
         
         return {
             "message": f"Group permission {assignment.permission_level.value} assigned successfully",
@@ -691,6 +694,7 @@ async def remove_workspace_permission(
         
         await db.delete(mapping)
         await db.commit()
+        invalidate_workspace(workspace_id)
         
         return {"message": "User permission removed successfully"}
     
@@ -719,6 +723,7 @@ async def remove_workspace_permission(
         
         await db.delete(mapping)
         await db.commit()
+        invalidate_workspace(workspace_id)
         
         return {"message": "Group permission removed successfully"}
     
@@ -36,6 +36,7 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = Field(default="HS256")
     JWT_EXPIRATION_MINUTES: int = Field(default=30)
+    RBAC_CACHE_TTL: int = Field(default=30)  # Seconds a workspace permission lookup is reused
     
     # OAuth 2.0 Configuration
     OAUTH_CLIENT_ID: str = Field(default="maxflowstudio")
@@ -73,6 +74,11 @@ class Settings(BaseSettings):
     RABBITMQ_USER: str = Field(default="guest")
     RABBITMQ_PASSWORD: str = Field(default="guest")
     RABBITMQ_VHOST: str = Field(default="/")
+    RABBITMQ_PREFETCH_COUNT: int = Field(default=64)  # Unacked deliveries per consumer channel
+    RABBITMQ_CHANNEL_POOL_SIZE: int = Field(default=8)  # Channels shared by publishers
+    RABBITMQ_MSGPACK_TASKS: bool = Field(default=False)  # Publish compact MessagePack task bodies; needs msgpack on every worker
+    WORKER_POOL_SIZE: int = Field(default=64)  # Queued tasks executed at once per worker process
+    WORKFLOW_MAX_WORKERS: int = Field(default=32)  # In-process workflow tasks executed at once
     
     @computed_field  # type: ignore[misc]
     @property
@@ -149,6 +149,10 @@ class BaseComponent(ABC):
     Runtime Error → Retry → Fallback → Log → Propagate
     """
     
+    # Same config and inputs always produce the same outputs, so results may be
+    # reused. Off by default; pure components without I/O, time or randomness opt in.
+    deterministic: bool = False
+    
     def __init__(self, **kwargs):
         """Initialize component with configuration."""
         self.id = str(uuid.uuid4())
@@ -164,6 +168,8 @@ class BaseComponent(ABC):
         self._execution_start_time: Optional[datetime] = None
         self._execution_end_time: Optional[datetime] = None
         self._current_execution_id: Optional[str] = None
+        self._execution_time: float = 0.0
+        self._error_message: Optional[str] = None
         
         self.logger.info("Component initialized", component_id=self.id)
     
@@ -363,12 +369,14 @@ class BaseComponent(ABC):
             # Validate inputs
             if not await self.validate_inputs():
                 self.status = ComponentStatus.FAILED
+                self._execution_time = 0.0
+                self._error_message = "Input validation failed"
                 return ComponentResult(
                     component_id=self.id,
                     execution_id=execution_id,
                     status=self.status,
-                    execution_time=0.0,
-                    error_message="Input validation failed"
+                    execution_time=self._execution_time,
+                    error_message=self._error_message
                 )
             
             # Execute core logic
@@ -385,6 +393,8 @@ class BaseComponent(ABC):
                 self.status = ComponentStatus.FAILED
                 error_msg = f"Component execution timed out after {self.config.timeout_seconds} seconds"
                 self.logger.error(error_msg)
+                self._execution_time = self.config.timeout_seconds
+                self._error_message = error_msg
                 return ComponentResult(
                     component_id=self.id,
                     execution_id=execution_id,
@@ -404,6 +414,8 @@ class BaseComponent(ABC):
             self.status = ComponentStatus.COMPLETED
             self._execution_end_time = datetime.utcnow()
             execution_time = (self._execution_end_time - self._execution_start_time).total_seconds()
+            self._execution_time = execution_time
+            self._error_message = None
             
             self.logger.info("Component execution completed successfully", 
                            execution_time=execution_time)
@@ -422,6 +434,8 @@ class BaseComponent(ABC):
             execution_time = (self._execution_end_time - self._execution_start_time).total_seconds()
             
             error_msg = f"Component execution failed: {str(e)}"
+            self._execution_time = execution_time
+            self._error_message = error_msg
             self.logger.error(error_msg, error=str(e), exc_info=True)
             
             return ComponentResult(
@@ -451,6 +465,25 @@ class BaseComponent(ABC):
             return cached_data["results"]
         return None
     
+    def reset(self) -> None:
+        """
+        Reset per-run state so the instance can execute again.
+        
+        Executors may reuse one instance across runs of the same flow node, so
+        subclasses that keep extra per-run state must clear it here. Long-lived
+        resources (API clients, loaded models) should be kept.
+        """
+        self._inputs = {}
+        self._outputs = {}
+        self._execution_context = {}
+        self._cache = {}
+        self._execution_start_time = None
+        self._execution_end_time = None
+        self._current_execution_id = None
+        self._execution_time = 0.0
+        self._error_message = None
+        self.status = ComponentStatus.IDLE
+    
     async def cleanup(self) -> None:
         """Cleanup component resources."""
         self._inputs.clear()
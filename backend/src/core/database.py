@@ -3,8 +3,9 @@ Database configuration and session management
 Flow: Settings -> Engine -> SessionLocal -> get_db dependency
 """
 
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 
@@ -12,6 +13,11 @@ from src.config.settings import get_settings
 
 settings = get_settings()
 
+
+def _json_serializer(value: Any) -> str:
+    """Encode JSON columns (flow definitions, execution outputs) with orjson; the driver needs str."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
 # Create async engine
 engine = create_async_engine(
     str(settings.DATABASE_URL),
@@ -20,6 +26,8 @@ engine = create_async_engine(
     pool_size=10,
     max_overflow=20,
     pool_pre_ping=True,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 
 # Create async session factory
@@ -3,6 +3,7 @@ Graph Execution State Management
 Flow: State initialization → Status tracking → Context management → Result collection
 """
 
+import asyncio
 import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Set
@@ -86,6 +87,12 @@ class GraphExecutionContext:
     # Error tracking
     errors: List[Dict[str, Any]] = field(default_factory=list)
     
+    # Futures of node outputs keyed by (component_type, frozen config, input identities)
+    _memo: Dict[tuple, "asyncio.Future[Dict[str, Any]]"] = field(default_factory=dict, repr=False)
+    
+    # Deferred component cleanups, awaited when the execution is cleaned up
+    _background_tasks: Set["asyncio.Task[None]"] = field(default_factory=set, repr=False)
+    
     def __post_init__(self):
         """Initialize context after creation."""
         self.logger = logger.bind(
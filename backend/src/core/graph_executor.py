@@ -4,9 +4,13 @@ Flow: Flow definition → Graph building → Validation → Execution → Result
 """
 
 import asyncio
+import hashlib
+import json
+import time
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional
 import structlog
 from pydantic import BaseModel, Field
 
@@ -22,6 +26,36 @@ from .graph_scheduler import GraphScheduler, CyclicDependencyError
 logger = structlog.get_logger()
 
 
+class _Unfreezable(Exception):
+    """Raised by _freeze(strict=True) for a value it can't key by content."""
+
+
+def _freeze(value: Any, strict: bool = False) -> Any:
+    """
+    Convert a value into a hashable form for memo keys.
+    
+    Leaves are tagged with their type so that e.g. 1, 1.0 and True stay distinct.
+    Unhashable leaves fall back to repr(), or raise _Unfreezable when strict,
+    since a default repr may only identify the object by address.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted(
+            ((repr(k), _freeze(v, strict)) for k, v in value.items()),
+            key=lambda item: item[0]
+        ))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v, strict) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v, strict) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        if strict:
+            raise _Unfreezable(type(value).__name__)
+        return repr(value)
+    return (type(value), value)
+
+
 class FlowDefinition(BaseModel):
     """
     Flow definition for graph execution.
@@ -39,6 +73,29 @@ class FlowDefinition(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
 
 
+@dataclass(frozen=True)
+class CompiledGraph:
+    """
+    Parsed and validated form of a flow definition.
+    
+    Built once per flow and shared by all of its executions; only the
+    per-execution state lives on GraphExecutionContext and the cloned
+    scheduler.
+    """
+    definition_hash: str
+    scheduler: GraphScheduler  # Template, cloned for every execution
+    
+    @staticmethod
+    def hash_definition(flow_definition: FlowDefinition) -> str:
+        """Hash the parts of a flow definition that shape the graph."""
+        payload = json.dumps(
+            [flow_definition.nodes, flow_definition.edges],
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
 class GraphExecutor:
     """
     Main graph execution engine using modular scheduler and state management.
@@ -68,6 +125,9 @@ class GraphExecutor:
         
         # Component instances cache
         self._component_cache: Dict[str, BaseComponent] = {}
+        
+        # Compiled graphs by flow ID
+        self._compiled: Dict[str, CompiledGraph] = {}
     
     async def execute_flow(self, flow_definition: FlowDefinition) -> GraphExecutionContext:
         """
@@ -86,11 +146,9 @@ class GraphExecutor:
         try:
             context.start_execution()
             
-            # Build execution graph
-            scheduler = await self._build_execution_graph(flow_definition, context)
-            
-            # Validate graph
-            scheduler.validate_graph()
+            # Get execution graph (built and validated once per flow definition)
+            compiled = await self._get_compiled_graph(flow_definition)
+            scheduler = compiled.scheduler.clone()
             
             # Execute nodes
             await self._execute_graph(scheduler, context)
@@ -107,16 +165,27 @@ class GraphExecutor:
         finally:
             # Cleanup
             await self._cleanup_execution(context)
-            if context.execution_id in self.active_executions:
-                del self.active_executions[context.execution_id]
+            self.active_executions.pop(context.execution_id, None)
         
         return context
     
-    async def _build_execution_graph(
-        self, 
-        flow_definition: FlowDefinition, 
-        context: GraphExecutionContext
-    ) -> GraphScheduler:
+    async def _get_compiled_graph(self, flow_definition: FlowDefinition) -> CompiledGraph:
+        """Return the compiled graph for a flow, building it on first use or after edits."""
+        definition_hash = CompiledGraph.hash_definition(flow_definition)
+        
+        compiled = self._compiled.get(flow_definition.id)
+        if compiled is not None and compiled.definition_hash == definition_hash:
+            return compiled
+        
+        # Build and validate execution graph
+        scheduler = await self._build_execution_graph(flow_definition)
+        scheduler.validate_graph()
+        
+        compiled = CompiledGraph(definition_hash=definition_hash, scheduler=scheduler)
+        self._compiled[flow_definition.id] = compiled
+        return compiled
+    
+    async def _build_execution_graph(self, flow_definition: FlowDefinition) -> GraphScheduler:
         """Build the execution graph from flow definition."""
         scheduler = GraphScheduler()
         
@@ -150,60 +219,43 @@ class GraphExecutor:
     
     async def _execute_graph(self, scheduler: GraphScheduler, context: GraphExecutionContext) -> None:
         """Execute the graph using parallel node execution."""
-        completed_nodes: Set[str] = set()
+        all_mask = scheduler.all_mask
         semaphore = asyncio.Semaphore(self.max_concurrent_nodes)
+        running: Dict[asyncio.Task, str] = {}
         
-        while len(completed_nodes) < len(scheduler.nodes):
-            # Get nodes ready for execution
-            ready_nodes = scheduler.get_ready_nodes(completed_nodes)
+        while scheduler.completed_mask != all_mask:
+            # Start nodes whose dependencies have all completed, critical path first
+            while (node_id := scheduler.next_ready()) is not None:
+                # Claim the node now so it isn't handed out again while queued on the semaphore
+                scheduler.update_node_status(node_id, NodeExecutionStatus.RUNNING)
+                task = asyncio.create_task(
+                    self._execute_node_with_semaphore(semaphore, scheduler, node_id, context)
+                )
+                running[task] = node_id
             
-            if not ready_nodes:
-                # Check if we're waiting for running nodes
-                running_nodes = [
+            if not running:
+                # No ready nodes and no running nodes - likely an error
+                remaining_nodes = {
                     node_id for node_id, node in scheduler.nodes.items()
-                    if node.status == NodeExecutionStatus.RUNNING
-                ]
-                
-                if not running_nodes:
-                    # No ready nodes and no running nodes - likely an error
-                    remaining_nodes = set(scheduler.nodes.keys()) - completed_nodes
-                    context.fail_execution(f"Execution stuck - remaining nodes: {remaining_nodes}")
-                    break
-                
-                # Wait a bit for running nodes to complete
-                await asyncio.sleep(0.1)
-                continue
-            
-            # Execute ready nodes in parallel
-            tasks = []
-            for node_id in ready_nodes:
-                if scheduler.nodes[node_id].status == NodeExecutionStatus.PENDING:
-                    task = asyncio.create_task(
-                        self._execute_node_with_semaphore(semaphore, scheduler, node_id, context)
-                    )
-                    tasks.append((node_id, task))
+                    if not scheduler.completed_mask & node.bit
+                }
+                context.fail_execution(f"Execution stuck - remaining nodes: {remaining_nodes}")
+                break
             
             # Wait for at least one task to complete
-            if tasks:
-                done, pending = await asyncio.wait(
-                    [task for _, task in tasks],
-                    return_when=asyncio.FIRST_COMPLETED
-                )
-                
-                # Update completed nodes
-                for node_id, task in tasks:
-                    if task in done:
-                        try:
-                            await task  # Ensure any exceptions are raised
-                            if scheduler.nodes[node_id].status == NodeExecutionStatus.COMPLETED:
-                                completed_nodes.add(node_id)
-                        except Exception as e:
-                            self.logger.error("Node execution failed", node_id=node_id, error=str(e))
-                            context.fail_node_execution(node_id, str(e))
-                            scheduler.update_node_status(node_id, NodeExecutionStatus.FAILED)
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            
+            for task in done:
+                node_id = running.pop(task)
+                try:
+                    await task  # Ensure any exceptions are raised
+                except Exception as e:
+                    self.logger.error("Node execution failed", node_id=node_id, error=str(e))
+                    context.fail_node_execution(node_id, str(e))
+                    scheduler.update_node_status(node_id, NodeExecutionStatus.FAILED)
         
         self.logger.info("Graph execution completed", 
-                        completed_count=len(completed_nodes),
+                        completed_count=scheduler.completed_mask.bit_count(),
                         total_count=len(scheduler.nodes))
     
     async def _execute_node_with_semaphore(
@@ -237,31 +289,66 @@ class GraphExecutor:
             # Set input values from connected nodes
             await self._set_node_inputs(component, scheduler, node_id, context)
             
-            # Initialize and execute component
-            await component.initialize()
-            await component.build_results()
+            # Reuse the result of an identical node (same type, config and inputs);
+            # non-deterministic components such as LLM calls always run
+            memo_key = None
+            memo_future = None
+            if component.deterministic:
+                memo_key = self._get_memo_key(node.component_type, node.config, component)
+                if memo_key is not None:
+                    memo_future = context._memo.get(memo_key)
             
-            # Get outputs
-            outputs = {}
-            for output_def in component.outputs:
-                value = component.get_output_value(output_def.name)
-                if value is not None:
-                    outputs[output_def.name] = value
+            if memo_future is not None:
+                producer_result = await asyncio.shield(memo_future)
+                outputs = dict(producer_result.outputs)
+                component_result = producer_result.model_copy(
+                    update={"component_id": component.id, "outputs": outputs}
+                )
+                self.logger.debug("Node outputs reused from memo", node_id=node_id)
+            else:
+                if memo_key is not None:
+                    memo_future = asyncio.get_running_loop().create_future()
+                    context._memo[memo_key] = memo_future
+                try:
+                    # Initialize and execute component
+                    started = time.perf_counter()
+                    await component.initialize()
+                    await component.build_results()
+                    
+                    # Get outputs
+                    outputs = {}
+                    for output_def in component.outputs:
+                        value = component.get_output_value(output_def.name)
+                        if value is not None:
+                            outputs[output_def.name] = value
+                    
+                    # build_results() is called directly, so the component's own
+                    # status and timing are never updated
+                    component_result = ComponentResult(
+                        component_id=component.id,
+                        execution_id=context.execution_id,
+                        status=ComponentStatus.COMPLETED,
+                        outputs=outputs,
+                        execution_time=time.perf_counter() - started
+                    )
+                except BaseException as e:
+                    if memo_future is not None:
+                        # Let waiting duplicates fail too, but don't memoize the failure
+                        del context._memo[memo_key]
+                        memo_future.set_exception(e)
+                        memo_future.exception()  # Mark retrieved when nobody is waiting
+                    raise
+                if memo_future is not None:
+                    memo_future.set_result(component_result)
             
             # Complete node execution
-            component_result = ComponentResult(
-                component_id=component.id,
-                status=component.status,
-                outputs=outputs,
-                execution_time=getattr(component, '_execution_time', 0.0),
-                error_message=getattr(component, '_error_message', None)
-            )
-            
             context.complete_node_execution(node_id, outputs, component_result)
             scheduler.update_node_status(node_id, NodeExecutionStatus.COMPLETED)
             
-            # Cleanup component
-            await component.cleanup()
+            # Cleanup component in the background so dependents can start now
+            cleanup_task = asyncio.create_task(component.cleanup())
+            context._background_tasks.add(cleanup_task)
+            cleanup_task.add_done_callback(context._background_tasks.discard)
             
         except Exception as e:
             error_msg = f"Node execution failed: {str(e)}"
@@ -269,6 +356,25 @@ class GraphExecutor:
             scheduler.update_node_status(node_id, NodeExecutionStatus.FAILED)
             raise
     
+    def _get_memo_key(
+        self, 
+        component_type: str, 
+        config: Dict[str, Any], 
+        component: BaseComponent
+    ) -> Optional[tuple]:
+        """
+        Build the memo key for a node from its type, config and input values.
+        
+        Inputs are keyed by content, not identity, since object ids are reused
+        once an object is freed. Returns None, disabling the memo for the node,
+        when an input can't be keyed by content.
+        """
+        try:
+            inputs = _freeze(component._inputs, strict=True)
+        except _Unfreezable:
+            return None
+        return (component_type, _freeze(config), inputs)
+    
     async def _create_component_instance(self, component_type: str, config: Dict[str, Any]) -> BaseComponent:
         """Create and configure a component instance."""
         component_class = registry.get_component_class(component_type)
@@ -303,6 +409,13 @@ class GraphExecutor:
     
     async def _cleanup_execution(self, context: GraphExecutionContext) -> None:
         """Cleanup resources after execution."""
+        # Wait for deferred component cleanups
+        if context._background_tasks:
+            results = await asyncio.gather(*context._background_tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    self.logger.warning("Component cleanup failed", error=str(result))
+        
         # Clear component cache for this execution
         # (In a more advanced implementation, this would be more sophisticated)
         self._component_cache.clear()
@@ -18,19 +18,32 @@ Flow: Flow definition → Node parsing → Dependency validation → Execution o
 """
 
 import asyncio
+import hashlib
+import time
 import uuid
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Set, Tuple
+from datetime import datetime, timedelta
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
 from enum import Enum
-from collections import defaultdict, deque
+from collections import ChainMap, deque, OrderedDict
+from dataclasses import dataclass, field
+import orjson
 import structlog
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from .component_base import BaseComponent, ComponentResult, ComponentStatus
+from .graph_kernels import build_csr, kahn_levels
+from .logging import is_debug_enabled
 
 logger = structlog.get_logger()
 
 
+def _serialize_mapping(value: Any) -> Dict[str, Any]:
+    """orjson fallback for mapping types such as the ChainMap of resolved inputs."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
 class ExecutionStatus(str, Enum):
     """Graph execution status."""
     PENDING = "pending"
@@ -54,6 +67,8 @@ class NodeExecutionStatus(str, Enum):
 
 class FlowNode(BaseModel):
     """Flow node definition."""
+    model_config = ConfigDict(frozen=True)
+    
     id: str = Field(..., description="Unique node identifier")
     component_type: str = Field(..., description="Component type/class name")
     display_name: str = Field(..., description="Human-readable node name")
@@ -67,6 +82,8 @@ class FlowNode(BaseModel):
 
 class FlowEdge(BaseModel):
     """Flow edge definition."""
+    model_config = ConfigDict(frozen=True)
+    
     id: str = Field(..., description="Unique edge identifier")
     source_node_id: str = Field(..., description="Source node ID")
     target_node_id: str = Field(..., description="Target node ID")
@@ -88,40 +105,74 @@ class FlowDefinition(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Flow metadata")
 
 
-class NodeExecution(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class NodeExecution:
     """Node execution state."""
-    node_id: str = Field(..., description="Node identifier")
-    status: NodeExecutionStatus = Field(default=NodeExecutionStatus.PENDING)
-    component: Optional[BaseComponent] = Field(default=None, description="Component instance")
-    dependencies: Set[str] = Field(default_factory=set, description="Dependency node IDs")
-    dependents: Set[str] = Field(default_factory=set, description="Dependent node IDs")
-    inputs: Dict[str, Any] = Field(default_factory=dict, description="Resolved input values")
-    outputs: Dict[str, Any] = Field(default_factory=dict, description="Node execution outputs")
-    result: Optional[ComponentResult] = Field(default=None, description="Execution result")
-    start_time: Optional[datetime] = Field(default=None)
-    end_time: Optional[datetime] = Field(default=None)
-    error_message: Optional[str] = Field(default=None)
-    
-    class Config:
-        arbitrary_types_allowed = True
+    node_id: str                                              # Node identifier
+    component_type: str = ""                                  # Component type/class name
+    config: Dict[str, Any] = field(default_factory=dict)      # Node configuration
+    status: NodeExecutionStatus = NodeExecutionStatus.PENDING
+    component: Optional[BaseComponent] = None                 # Component instance
+    component_key: Optional[Tuple] = None                     # Key in the executor's component pool
+    dependencies: FrozenSet[str] = frozenset()                # Dependency node IDs
+    dependents: FrozenSet[str] = frozenset()                  # Dependent node IDs
+    inputs: Dict[str, Any] = field(default_factory=dict)      # Static input values
+    edge_inputs: Dict[str, Any] = field(default_factory=dict) # Outputs pushed in by dependencies
+    resolved_inputs: ChainMap = field(default_factory=ChainMap)  # Layered view built with the graph
+    outputs: Dict[str, Any] = field(default_factory=dict)     # Node execution outputs
+    result: Optional[ComponentResult] = None                  # Execution result
+    start_ns: Optional[int] = None                            # time.perf_counter_ns() at start
+    end_ns: Optional[int] = None                              # time.perf_counter_ns() at end
+    error_message: Optional[str] = None
+    
+    @property
+    def execution_time(self) -> Optional[float]:
+        """Node execution time in seconds."""
+        if self.start_ns is None or self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e9
 
 
-class ExecutionContext(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ExecutionContext:
     """Graph execution context."""
-    execution_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    flow_id: str = Field(..., description="Flow identifier")
-    flow_definition: Optional[FlowDefinition] = Field(default=None, description="Complete flow definition")
-    status: ExecutionStatus = Field(default=ExecutionStatus.PENDING)
-    start_time: datetime = Field(default_factory=datetime.utcnow)
-    end_time: Optional[datetime] = Field(default=None)
-    global_variables: Dict[str, Any] = Field(default_factory=dict)
-    shared_context: Dict[str, Any] = Field(default_factory=dict)
-    execution_order: List[List[str]] = Field(default_factory=list, description="Execution batches")
-    node_executions: Dict[str, NodeExecution] = Field(default_factory=dict)
-    error_message: Optional[str] = Field(default=None)
-    
-    class Config:
-        arbitrary_types_allowed = True
+    execution_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    flow_id: str                                              # Flow identifier
+    status: ExecutionStatus = ExecutionStatus.PENDING
+    start_time: datetime = field(default_factory=datetime.utcnow)
+    start_ns: int = field(default_factory=time.perf_counter_ns)  # Monotonic anchor for start_time
+    end_time: Optional[datetime] = None
+    global_variables: Dict[str, Any] = field(default_factory=dict)
+    shared_context: Dict[str, Any] = field(default_factory=dict)
+    execution_order: List[List[str]] = field(default_factory=list)          # Execution batches
+    node_executions: Dict[str, NodeExecution] = field(default_factory=dict)
+    # Outgoing edges by source node ID: [(target_node_id, source_handle, target_handle)]
+    outgoing_edges: Dict[str, List[Tuple[str, str, str]]] = field(default_factory=dict)
+    error_message: Optional[str] = None
+    
+    # Scheduler view of the graph as parallel dicts, so ordering and completion
+    # propagation don't walk the full NodeExecution objects
+    _sched_deps: Dict[str, FrozenSet[str]] = field(default_factory=dict, repr=False)
+    _sched_dependents: Dict[str, FrozenSet[str]] = field(default_factory=dict, repr=False)
+    _sched_status: Dict[str, NodeExecutionStatus] = field(default_factory=dict, repr=False)
+    
+    def wall_time(self, ns: int) -> datetime:
+        """Convert a time.perf_counter_ns() reading into a UTC datetime."""
+        return self.start_time + timedelta(microseconds=(ns - self.start_ns) // 1000)
+    
+    def mark_end(self) -> None:
+        """Set end_time from the monotonic clock."""
+        self.end_time = self.wall_time(time.perf_counter_ns())
+
+
+class StructurePlan(BaseModel):
+    """Dependency structure and execution order derived from a flow's nodes and edges."""
+    execution_order: List[List[str]] = Field(..., description="Execution batches")
+    dependencies: Dict[str, FrozenSet[str]] = Field(..., description="Dependency node IDs by node")
+    dependents: Dict[str, FrozenSet[str]] = Field(..., description="Dependent node IDs by node")
+    outgoing_edges: Dict[str, List[Tuple[str, str, str]]] = Field(
+        ..., description="Outgoing (target node ID, source handle, target handle) by source node ID"
+    )
 
 
 class GraphExecutor:
@@ -144,12 +195,47 @@ class GraphExecutor:
     Validation Error → Early termination → Return error context
     """
     
-    def __init__(self, component_registry: Optional[Dict[str, type]] = None):
+    def __init__(
+        self, 
+        component_registry: Optional[Dict[str, type]] = None,
+        memo_cache_size: int = 1024,
+        max_parallel_nodes: int = 32,
+        component_cache_size: int = 256,
+        max_idle_components: int = 4,
+        structure_cache_size: int = 128
+    ):
         """Initialize graph executor with component registry."""
         self.component_registry = component_registry or {}
         self.logger = logger.bind(executor_id=str(uuid.uuid4()))
+        # Checked once so hot paths skip building kwargs for filtered debug calls
+        self._debug_enabled = is_debug_enabled(self.logger)
         self._active_executions: Dict[str, ExecutionContext] = {}
-        
+        # Flow definitions are kept off the context so status snapshots stay small
+        self._flow_defs_by_execution: Dict[str, FlowDefinition] = {}
+        
+        # Bounds concurrently executing nodes across all executions
+        self.max_parallel_nodes = max_parallel_nodes
+        self._node_semaphore = asyncio.Semaphore(max_parallel_nodes)
+        
+        # Idle component instances per (flow_id, node_id) (LRU), stored with the
+        # component key they were built for; a new config replaces the entry
+        self.component_cache_size = component_cache_size
+        self.max_idle_components = max_idle_components
+        self._component_cache: "OrderedDict[Tuple[str, str], Tuple[Tuple, List[BaseComponent]]]" = OrderedDict()
+        
+        # Structure plans keyed by node/edge fingerprint (LRU)
+        self.structure_cache_size = structure_cache_size
+        self._structure_cache: "OrderedDict[Tuple, StructurePlan]" = OrderedDict()
+        
+        # Results of deterministic nodes, keyed by content hash (LRU)
+        self.memo_cache_size = memo_cache_size
+        self._memo_cache: "OrderedDict[str, ComponentResult]" = OrderedDict()
+        
+    @staticmethod
+    def load_flow(raw: bytes | str) -> FlowDefinition:
+        """Parse a raw JSON flow definition with orjson and validate it in one pass."""
+        return FlowDefinition.model_validate(orjson.loads(raw))
+
     def register_component(self, component_type: str, component_class: type) -> None:
         """Register a component class for instantiation."""
         if not issubclass(component_class, BaseComponent):
@@ -190,12 +276,12 @@ class GraphExecutor:
         context = ExecutionContext(
             execution_id=execution_id,
             flow_id=flow_definition.id,
-            flow_definition=flow_definition,
             global_variables=flow_definition.global_variables.copy(),
             shared_context=initial_inputs or {}
         )
         
         self._active_executions[execution_id] = context
+        self._flow_defs_by_execution[execution_id] = flow_definition
         self.logger.info("Starting flow execution", 
                         execution_id=execution_id, 
                         flow_id=flow_definition.id,
@@ -204,17 +290,34 @@ class GraphExecutor:
         try:
             context.status = ExecutionStatus.RUNNING
             
-            # Step 1: Build dependency graph
-            self.logger.info("Building dependency graph")
-            await self._build_dependency_graph(flow_definition, context)
+            structure_key = self._get_structure_key(flow_definition)
+            plan = self._structure_cache.get(structure_key)
+            if plan is not None:
+                self._structure_cache.move_to_end(structure_key)
             
-            # Step 2: Validate flow structure
-            self.logger.info("Validating flow structure")
-            await self._validate_flow_structure(context)
+            # Step 1: Build dependency graph
+            self.logger.info("Building dependency graph", cached_structure=plan is not None)
+            await self._build_dependency_graph(flow_definition, context, plan)
             
-            # Step 3: Calculate execution order
-            self.logger.info("Calculating execution order")
-            await self._calculate_execution_order(context)
+            if plan is None:
+                # Step 2: Validate flow structure
+                self.logger.info("Validating flow structure")
+                await self._validate_flow_structure(context)
+                
+                # Step 3: Calculate execution order
+                self.logger.info("Calculating execution order")
+                await self._calculate_execution_order(context)
+                
+                self._structure_cache[structure_key] = StructurePlan(
+                    execution_order=context.execution_order,
+                    dependencies=context._sched_deps,
+                    dependents=context._sched_dependents,
+                    outgoing_edges=context.outgoing_edges
+                )
+                while len(self._structure_cache) > self.structure_cache_size:
+                    self._structure_cache.popitem(last=False)
+            else:
+                context.execution_order = plan.execution_order
             
             # Step 4: Execute nodes
             self.logger.info("Starting node execution")
@@ -222,7 +325,7 @@ class GraphExecutor:
             
             # Step 5: Finalize execution
             context.status = ExecutionStatus.COMPLETED
-            context.end_time = datetime.utcnow()
+            context.mark_end()
             
             execution_time = (context.end_time - context.start_time).total_seconds()
             self.logger.info("Flow execution completed successfully", 
@@ -232,7 +335,7 @@ class GraphExecutor:
             
         except Exception as e:
             context.status = ExecutionStatus.FAILED
-            context.end_time = datetime.utcnow()
+            context.mark_end()
             context.error_message = str(e)
             
             self.logger.error("Flow execution failed", 
@@ -242,18 +345,35 @@ class GraphExecutor:
         
         finally:
             # Cleanup
-            if execution_id in self._active_executions:
-                del self._active_executions[execution_id]
+            self._release_components(context)
+            self._active_executions.pop(execution_id, None)
+            self._flow_defs_by_execution.pop(execution_id, None)
         
         return context
     
-    async def _build_dependency_graph(self, flow_definition: FlowDefinition, context: ExecutionContext) -> None:
+    @staticmethod
+    def _get_structure_key(flow_definition: FlowDefinition) -> Tuple:
+        """Fingerprint the parts of a flow definition that determine its structure."""
+        return (
+            tuple(sorted(node.id for node in flow_definition.nodes)),
+            tuple(
+                (edge.source_node_id, edge.target_node_id, edge.source_handle, edge.target_handle)
+                for edge in flow_definition.edges
+            )
+        )
+    
+    async def _build_dependency_graph(
+        self, 
+        flow_definition: FlowDefinition, 
+        context: ExecutionContext,
+        plan: Optional[StructurePlan] = None
+    ) -> None:
         """
         Build dependency graph from flow definition.
         
         Dependency Building Process:
         1. Create node execution objects
-        2. Parse edges to build dependency relationships
+        2. Parse edges to build dependency relationships (or copy them from a cached plan)
         3. Initialize components for each node
         4. Validate component instantiation
         """
@@ -261,73 +381,166 @@ class GraphExecutor:
         for node in flow_definition.nodes:
             node_exec = NodeExecution(
                 node_id=node.id,
+                component_type=node.component_type,
+                config=node.config,
                 inputs=node.inputs.copy()
             )
+            # Dependency outputs → shared context → global variables → static inputs
+            node_exec.resolved_inputs = ChainMap(
+                node_exec.edge_inputs,
+                context.shared_context,
+                context.global_variables,
+                node_exec.inputs
+            )
             context.node_executions[node.id] = node_exec
         
-        # Build dependencies from edges
-        edge_map = defaultdict(list)
-        reverse_edge_map = defaultdict(list)
-        
-        for edge in flow_definition.edges:
-            edge_map[edge.source_node_id].append(edge)
-            reverse_edge_map[edge.target_node_id].append(edge)
+        if plan is not None:
+            # Reuse the dependency structure computed by an earlier execution;
+            # the sets are frozen, so they are shared rather than copied
+            for node_id, node_exec in context.node_executions.items():
+                node_exec.dependencies = plan.dependencies[node_id]
+                node_exec.dependents = plan.dependents[node_id]
+            context.outgoing_edges = plan.outgoing_edges
+        else:
+            # Build dependencies and the outgoing edge index from edges
+            outgoing_edges = context.outgoing_edges
+            dependencies: Dict[str, Set[str]] = {node_id: set() for node_id in context.node_executions}
+            dependents: Dict[str, Set[str]] = {node_id: set() for node_id in context.node_executions}
             
-            # Add dependency relationships
-            source_exec = context.node_executions[edge.source_node_id]
-            target_exec = context.node_executions[edge.target_node_id]
+            for edge in flow_definition.edges:
+                outgoing_edges.setdefault(edge.source_node_id, []).append(
+                    (edge.target_node_id, edge.source_handle, edge.target_handle)
+                )
+                
+                # Add dependency relationships
+                dependencies[edge.target_node_id].add(edge.source_node_id)
+                dependents[edge.source_node_id].add(edge.target_node_id)
             
-            target_exec.dependencies.add(edge.source_node_id)
-            source_exec.dependents.add(edge.target_node_id)
-        
-        # Initialize components
+            # The graph is fixed from here on
+            for node_id, node_exec in context.node_executions.items():
+                node_exec.dependencies = frozenset(dependencies[node_id])
+                node_exec.dependents = frozenset(dependents[node_id])
+        
+        # Scheduler arrays share the dependency sets of the node executions
+        for node_id, node_exec in context.node_executions.items():
+            context._sched_deps[node_id] = node_exec.dependencies
+            context._sched_dependents[node_id] = node_exec.dependents
+            context._sched_status[node_id] = NodeExecutionStatus.PENDING
+        
+        # Initialize components, reusing idle instances from earlier executions
+        to_create: List[Tuple[FlowNode, type]] = []
         for node in flow_definition.nodes:
             component_class = self.component_registry.get(node.component_type)
             if not component_class:
                 raise ValueError(f"Unknown component type: {node.component_type}")
             
+            node_exec = context.node_executions[node.id]
+            node_exec.component_key = self._get_component_key(flow_definition.id, node)
+            
+            component = self._take_idle_component(flow_definition.id, node.id, node_exec.component_key)
+            if component is not None:
+                node_exec.component = component
+            else:
+                to_create.append((node, component_class))
+        
+        # Constructors may block on I/O (models, connections), so run them concurrently
+        components = await asyncio.gather(*(
+            self._create_component(node, component_class)
+            for node, component_class in to_create
+        ))
+        for (node, _), component in zip(to_create, components):
+            context.node_executions[node.id].component = component
+    
+    async def _create_component(self, node: FlowNode, component_class: type) -> BaseComponent:
+        """Instantiate a node's component in a worker thread."""
+        try:
+            component = await asyncio.to_thread(component_class, **node.config)
+        except Exception as e:
+            raise ValueError(f"Failed to initialize component {node.component_type} for node {node.id}: {str(e)}")
+        
+        if self._debug_enabled:
+            self.logger.debug("Component initialized", 
+                            node_id=node.id, 
+                            component_type=node.component_type)
+        return component
+    
+    @staticmethod
+    def _get_component_key(flow_id: str, node: FlowNode) -> Optional[Tuple]:
+        """Key a node's component instance by flow, node and configuration."""
+        try:
+            config_fingerprint = orjson.dumps(node.config, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            return None
+        
+        return (flow_id, node.id, node.component_type, config_fingerprint)
+    
+    def _take_idle_component(
+        self, 
+        flow_id: str, 
+        node_id: str, 
+        component_key: Optional[Tuple]
+    ) -> Optional[BaseComponent]:
+        """Pop an idle instance built for component_key, dropping ones for an older config."""
+        pooled = self._component_cache.get((flow_id, node_id))
+        if pooled is None or component_key is None:
+            return None
+        
+        pooled_key, idle_components = pooled
+        if pooled_key != component_key:
+            del self._component_cache[(flow_id, node_id)]
+            return None
+        
+        self._component_cache.move_to_end((flow_id, node_id))
+        return idle_components.pop() if idle_components else None
+    
+    def _release_components(self, context: ExecutionContext) -> None:
+        """Reset the execution's components and return them to the idle pool."""
+        for node_id, node_exec in context.node_executions.items():
+            component = node_exec.component
+            component_key = node_exec.component_key
+            if component is None or component_key is None:
+                continue
+            
+            pool_key = (component_key[0], node_id)
+            pooled = self._component_cache.get(pool_key)
+            if pooled is not None and (
+                pooled[0] != component_key or len(pooled[1]) >= self.max_idle_components
+            ):
+                # Built for a replaced config, or enough instances are idle already
+                continue
+            
             try:
-                component = component_class(**node.config)
-                context.node_executions[node.id].component = component
-                self.logger.debug("Component initialized", 
-                                node_id=node.id, 
-                                component_type=node.component_type)
+                component.reset()
             except Exception as e:
-                raise ValueError(f"Failed to initialize component {node.component_type} for node {node.id}: {str(e)}")
+                self.logger.warning("Component reset failed", 
+                                  node_id=node_exec.node_id, 
+                                  error=str(e))
+                continue
+            
+            if pooled is None:
+                pooled = self._component_cache[pool_key] = (component_key, [])
+            pooled[1].append(component)
+            self._component_cache.move_to_end(pool_key)
+            while len(self._component_cache) > self.component_cache_size:
+                self._component_cache.popitem(last=False)
     
     async def _validate_flow_structure(self, context: ExecutionContext) -> None:
         """
-        Validate flow structure for cycles and orphaned nodes.
+        Validate flow structure for orphaned nodes and edge connections.
         
         Validation Checks:
-        1. Detect circular dependencies
-        2. Identify orphaned nodes
-        3. Validate edge connections
-        4. Check required inputs
-        """
-        # Check for circular dependencies using DFS
-        visited = set()
-        rec_stack = set()
+        1. Identify orphaned nodes
+        2. Validate edge connections
         
-        def has_cycle(node_id: str) -> bool:
-            visited.add(node_id)
-            rec_stack.add(node_id)
-            
-            node_exec = context.node_executions[node_id]
-            for dependent_id in node_exec.dependents:
-                if dependent_id not in visited:
-                    if has_cycle(dependent_id):
-                        return True
-                elif dependent_id in rec_stack:
-                    return True
-            
-            rec_stack.remove(node_id)
-            return False
-        
-        for node_id in context.node_executions:
-            if node_id not in visited:
-                if has_cycle(node_id):
-                    raise ValueError(f"Circular dependency detected in flow starting from node: {node_id}")
+        Circular dependencies are detected by _calculate_execution_order, whose
+        topological sort stops with an error when no ready nodes remain.
+        """
+        orphaned_nodes = [
+            node_id for node_id, node_exec in context.node_executions.items()
+            if not node_exec.dependencies and not node_exec.dependents
+        ]
+        if orphaned_nodes and len(context.node_executions) > 1:
+            self.logger.debug("Flow contains unconnected nodes", node_ids=orphaned_nodes)
         
         self.logger.debug("Flow structure validation completed")
     
@@ -342,32 +555,28 @@ class GraphExecutor:
         4. Repeat until all nodes are processed
         5. Result: List of parallel execution batches
         """
-        # Calculate in-degree for each node
-        in_degree = {}
-        for node_id in context.node_executions:
-            in_degree[node_id] = len(context.node_executions[node_id].dependencies)
+        # Index nodes once and lay dependents out as CSR integer arrays
+        node_ids = list(context._sched_deps)
+        id_to_idx = {node_id: idx for idx, node_id in enumerate(node_ids)}
+        sched_dependents = context._sched_dependents
         
-        execution_order = []
+        indptr, indices = build_csr([
+            [id_to_idx[dependent_id] for dependent_id in sched_dependents[node_id]]
+            for node_id in node_ids
+        ])
+        in_degree = [len(context._sched_deps[node_id]) for node_id in node_ids]
         
-        while in_degree:
-            # Find nodes with no dependencies (can execute in parallel)
-            ready_nodes = [node_id for node_id, degree in in_degree.items() if degree == 0]
-            
-            if not ready_nodes:
-                remaining_nodes = list(in_degree.keys())
-                raise ValueError(f"Deadlock detected: remaining nodes {remaining_nodes} have circular dependencies")
-            
-            execution_order.append(ready_nodes)
-            
-            # Remove processed nodes and update dependencies
-            for node_id in ready_nodes:
-                del in_degree[node_id]
-                
-                # Decrease in-degree of dependent nodes
-                node_exec = context.node_executions[node_id]
-                for dependent_id in node_exec.dependents:
-                    if dependent_id in in_degree:
-                        in_degree[dependent_id] -= 1
+        # Compiled with numba for large graphs when it is installed
+        order, level_ptr, remaining = kahn_levels(indptr, indices, in_degree)
+        
+        if len(order) < len(node_ids):
+            remaining_nodes = [node_ids[idx] for idx, degree in enumerate(remaining) if degree > 0]
+            raise ValueError(f"Circular dependency detected: remaining nodes {remaining_nodes} have circular dependencies")
+        
+        execution_order = [
+            [node_ids[idx] for idx in order[level_ptr[batch]:level_ptr[batch + 1]]]
+            for batch in range(len(level_ptr) - 1)
+        ]
         
         context.execution_order = execution_order
         self.logger.info("Execution order calculated", 
@@ -376,48 +585,78 @@ class GraphExecutor:
     
     async def _execute_nodes_parallel(self, context: ExecutionContext) -> None:
         """
-        Execute nodes in parallel batches according to dependency order.
+        Execute nodes in parallel as soon as their dependencies complete.
         
         Parallel Execution Process:
-        1. For each execution batch:
-        2. Prepare inputs for all nodes in batch
-        3. Execute all nodes concurrently
-        4. Wait for all to complete
-        5. Propagate outputs to dependent nodes
-        6. Handle any errors
+        1. Seed a ready queue with nodes that have no dependencies
+        2. Worker tasks take nodes from the queue and execute them
+        3. On completion, decrement in-degree of dependent nodes
+        4. Queue dependents whose in-degree reaches zero
+        5. On failure, stop releasing new nodes and skip dependents
+        
+        Unlike stepping through context.execution_order batch by batch, a node
+        starts as soon as its own dependencies are done, so one slow node only
+        delays its own dependents.
         """
-        for batch_index, node_batch in enumerate(context.execution_order):
-            self.logger.info("Executing batch", 
-                           batch_index=batch_index, 
-                           batch_size=len(node_batch))
-            
-            # Prepare and execute nodes in parallel
-            execution_tasks = []
-            for node_id in node_batch:
-                task = self._execute_single_node(node_id, context)
-                execution_tasks.append(task)
-            
-            # Wait for all nodes in batch to complete
-            try:
-                await asyncio.gather(*execution_tasks)
-                self.logger.info("Batch completed successfully", batch_index=batch_index)
-            except Exception as e:
-                self.logger.error("Batch execution failed", 
-                                batch_index=batch_index, 
-                                error=str(e))
-                # Continue with error handling
-                break
-            
-            # Check if any node in the batch failed
-            failed_nodes = [node_id for node_id in node_batch 
-                          if context.node_executions[node_id].status == NodeExecutionStatus.FAILED]
-            
-            if failed_nodes:
-                self.logger.error("Nodes failed in batch", 
-                                batch_index=batch_index, 
-                                failed_nodes=failed_nodes)
-                await self._handle_batch_failure(failed_nodes, context)
-                break
+        sched_dependents = context._sched_dependents
+        sched_status = context._sched_status
+        in_degree = {node_id: len(deps) for node_id, deps in context._sched_deps.items()}
+        if not in_degree:
+            return
+        
+        ready_queue: asyncio.Queue = asyncio.Queue()
+        for node_id, degree in in_degree.items():
+            if degree == 0:
+                ready_queue.put_nowait(node_id)
+        
+        worker_count = min(self.max_parallel_nodes, len(in_degree))
+        outstanding = ready_queue.qsize()  # Queued or running nodes
+        failed_nodes: List[str] = []
+        
+        async def worker() -> None:
+            nonlocal outstanding
+            while True:
+                node_id = await ready_queue.get()
+                if node_id is None:
+                    return
+                
+                try:
+                    await self._execute_single_node_gated(node_id, context)
+                    
+                    if sched_status[node_id] == NodeExecutionStatus.FAILED:
+                        failed_nodes.append(node_id)
+                    elif not failed_nodes:
+                        # Release dependents whose dependencies are all done
+                        for dependent_id in sched_dependents[node_id]:
+                            in_degree[dependent_id] -= 1
+                            if in_degree[dependent_id] == 0:
+                                ready_queue.put_nowait(dependent_id)
+                                outstanding += 1
+                finally:
+                    outstanding -= 1
+                    if outstanding == 0:
+                        # Nothing queued or running - stop all workers
+                        for _ in range(worker_count):
+                            ready_queue.put_nowait(None)
+        
+        results = await asyncio.gather(
+            *(worker() for _ in range(worker_count)),
+            return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            self.logger.error("Node execution worker failed", error=str(errors[0]))
+        
+        if failed_nodes:
+            self.logger.error("Nodes failed during execution", failed_nodes=failed_nodes)
+            await self._handle_batch_failure(failed_nodes, context)
+        else:
+            self.logger.info("All nodes executed", node_count=len(in_degree))
+    
+    async def _execute_single_node_gated(self, node_id: str, context: ExecutionContext) -> None:
+        """Execute a single node once a concurrency slot is available."""
+        async with self._node_semaphore:
+            await self._execute_single_node(node_id, context)
     
     async def _execute_single_node(self, node_id: str, context: ExecutionContext) -> None:
         """
@@ -427,117 +666,138 @@ class GraphExecutor:
         1. Resolve inputs from dependencies and context
         2. Set node status to running
         3. Execute component
-        4. Store results and outputs
+        4. Store results and push outputs to dependents
         5. Update node status
         """
         node_exec = context.node_executions[node_id]
         node_exec.status = NodeExecutionStatus.RUNNING
-        node_exec.start_time = datetime.utcnow()
+        node_exec.start_ns = time.perf_counter_ns()
+        context._sched_status[node_id] = NodeExecutionStatus.RUNNING
         
-        self.logger.debug("Starting node execution", node_id=node_id)
+        nlog = self.logger.bind(node_id=node_id)
+        if self._debug_enabled:
+            nlog.debug("Starting node execution")
         
         try:
             # Resolve inputs from dependencies
             resolved_inputs = await self._resolve_node_inputs(node_id, context)
             
-            # Execute component
+            # Execute component, reusing the result of an identical earlier run
             if node_exec.component:
-                result = await node_exec.component.execute(
-                    inputs=resolved_inputs,
-                    execution_id=f"{context.execution_id}:{node_id}"
-                )
+                memo_key = None
+                if node_exec.component.deterministic:
+                    memo_key = self._get_memo_key(node_exec, resolved_inputs)
+                
+                result = self._memo_cache.get(memo_key) if memo_key else None
+                if result is not None:
+                    self._memo_cache.move_to_end(memo_key)
+                    # Don't share the cached outputs dict with this execution
+                    result = result.model_copy(update={"outputs": dict(result.outputs)})
+                    if self._debug_enabled:
+                        nlog.debug("Node result reused from memo cache")
+                else:
+                    result = await node_exec.component.execute(
+                        inputs=resolved_inputs,
+                        execution_id=f"{context.execution_id}:{node_id}"
+                    )
+                    if memo_key and result.status == ComponentStatus.COMPLETED:
+                        self._store_memo_result(memo_key, result)
                 
                 node_exec.result = result
                 node_exec.outputs = result.outputs
                 
                 if result.status == ComponentStatus.COMPLETED:
                     node_exec.status = NodeExecutionStatus.COMPLETED
-                    self.logger.debug("Node execution completed", 
-                                    node_id=node_id,
-                                    execution_time=result.execution_time)
+                    self._push_node_outputs(node_id, node_exec.outputs, context)
+                    if self._debug_enabled:
+                        nlog.debug("Node execution completed", execution_time=result.execution_time)
                 else:
                     node_exec.status = NodeExecutionStatus.FAILED
                     node_exec.error_message = result.error_message
-                    self.logger.error("Node execution failed", 
-                                    node_id=node_id,
-                                    error=result.error_message)
+                    nlog.error("Node execution failed", error=result.error_message)
             else:
                 raise ValueError(f"No component available for node {node_id}")
                 
         except Exception as e:
             node_exec.status = NodeExecutionStatus.FAILED
             node_exec.error_message = str(e)
-            self.logger.error("Node execution exception", 
-                            node_id=node_id, 
-                            error=str(e), 
-                            exc_info=True)
+            nlog.error("Node execution exception", error=str(e), exc_info=True)
         
         finally:
-            node_exec.end_time = datetime.utcnow()
+            node_exec.end_ns = time.perf_counter_ns()
+            context._sched_status[node_id] = node_exec.status
     
-    async def _resolve_node_inputs(self, node_id: str, context: ExecutionContext) -> Dict[str, Any]:
+    def _get_memo_key(self, node_exec: NodeExecution, resolved_inputs: Mapping[str, Any]) -> Optional[str]:
         """
-        Resolve inputs for a node from dependencies and global context.
+        Hash component type, config and resolved inputs into a memo key.
         
-        Input Resolution Process:
-        1. Start with node's static input values
-        2. Override with outputs from dependency nodes
-        3. Apply global variables and shared context
-        4. Validate required inputs are present
+        Returns None when the values are not JSON serializable, in which case
+        the node is simply executed without memoization.
         """
-        node_exec = context.node_executions[node_id]
-        resolved_inputs = node_exec.inputs.copy()
+        try:
+            payload = orjson.dumps(
+                (node_exec.component_type, node_exec.config, resolved_inputs),
+                default=_serialize_mapping,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            return None
         
-        # Add global variables
-        resolved_inputs.update(context.global_variables)
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def _store_memo_result(self, memo_key: str, result: ComponentResult) -> None:
+        """Store a node result in the memo cache, evicting the least recently used."""
+        self._memo_cache[memo_key] = result
+        self._memo_cache.move_to_end(memo_key)
+        while len(self._memo_cache) > self.memo_cache_size:
+            self._memo_cache.popitem(last=False)
+    
+    async def _resolve_node_inputs(self, node_id: str, context: ExecutionContext) -> ChainMap:
+        """
+        Resolve inputs for a node from dependencies and global context.
         
-        # Add shared context
-        resolved_inputs.update(context.shared_context)
+        Inputs are layered (highest priority first) as dependency outputs →
+        shared context → global variables → static node inputs. The ChainMap
+        is built with the graph and dependencies push their outputs into its
+        first layer as they complete, so nothing is looked up here.
+        """
+        node_exec = context.node_executions[node_id]
         
-        # Override with dependency outputs using edge mapping
-        edges_to_node = [edge for edge in context.flow_definition.edges if edge.target_node_id == node_id]
+        if self._debug_enabled:
+            self.logger.debug("Node inputs resolved", 
+                            node_id=node_id, 
+                            edge_input_keys=list(node_exec.edge_inputs))
         
-        for edge in edges_to_node:
-            dep_node_exec = context.node_executions[edge.source_node_id]
-            if dep_node_exec.status == NodeExecutionStatus.COMPLETED:
-                # Map specific output to specific input using edge handles
-                source_output = edge.source_handle
-                target_input = edge.target_handle
-                
-                if source_output in dep_node_exec.outputs:
-                    resolved_inputs[target_input] = dep_node_exec.outputs[source_output]
+        return node_exec.resolved_inputs
+    
+    def _push_node_outputs(self, node_id: str, outputs: Dict[str, Any], context: ExecutionContext) -> None:
+        """Map a completed node's outputs onto the inputs of its dependents using edge handles."""
+        node_executions = context.node_executions
+        for target_node_id, source_output, target_input in context.outgoing_edges.get(node_id, ()):
+            if source_output in outputs:
+                node_executions[target_node_id].edge_inputs[target_input] = outputs[source_output]
+                if self._debug_enabled:
                     self.logger.debug("Edge mapped input", 
-                                    source_node=edge.source_node_id,
-                                    target_node=node_id,
+                                    source_node=node_id,
+                                    target_node=target_node_id,
                                     source_output=source_output,
                                     target_input=target_input)
-            else:
-                self.logger.warning("Dependency node not completed", 
-                                  node_id=node_id, 
-                                  dependency=edge.source_node_id,
-                                  dep_status=dep_node_exec.status)
-        
-        self.logger.debug("Node inputs resolved", 
-                        node_id=node_id, 
-                        input_keys=list(resolved_inputs.keys()))
-        
-        return resolved_inputs
     
     async def _handle_batch_failure(self, failed_nodes: List[str], context: ExecutionContext) -> None:
         """Handle failure of nodes in a batch."""
         # Mark all dependent nodes as skipped
         skipped_nodes = set()
         
-        def mark_dependents_skipped(node_id: str):
-            node_exec = context.node_executions[node_id]
-            for dependent_id in node_exec.dependents:
+        # Breadth-first walk over dependents, without recursion
+        queue = deque(failed_nodes)
+        while queue:
+            node_id = queue.popleft()
+            for dependent_id in context._sched_dependents[node_id]:
                 if dependent_id not in skipped_nodes:
                     skipped_nodes.add(dependent_id)
+                    context._sched_status[dependent_id] = NodeExecutionStatus.SKIPPED
                     context.node_executions[dependent_id].status = NodeExecutionStatus.SKIPPED
-                    mark_dependents_skipped(dependent_id)
-        
-        for failed_node_id in failed_nodes:
-            mark_dependents_skipped(failed_node_id)
+                    queue.append(dependent_id)
         
         self.logger.info("Marked dependent nodes as skipped", 
                        failed_nodes=failed_nodes, 
@@ -547,12 +807,16 @@ class GraphExecutor:
         """Get current execution status."""
         return self._active_executions.get(execution_id)
     
+    def get_flow_definition(self, execution_id: str) -> Optional[FlowDefinition]:
+        """Get the flow definition of an active execution."""
+        return self._flow_defs_by_execution.get(execution_id)
+    
     async def cancel_execution(self, execution_id: str) -> bool:
         """Cancel an active execution."""
         if execution_id in self._active_executions:
             context = self._active_executions[execution_id]
             context.status = ExecutionStatus.CANCELLED
-            context.end_time = datetime.utcnow()
+            context.mark_end()
             
             self.logger.info("Execution cancelled", execution_id=execution_id)
             return True
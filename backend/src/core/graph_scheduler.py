@@ -4,14 +4,27 @@ Flow: Dependency analysis → Topological sorting → Execution scheduling → P
 """
 
 import asyncio
-from typing import Any, Dict, List, Optional, Set, Tuple
-from collections import defaultdict, deque
+import copy
+import heapq
+from array import array
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterator, List, Mapping, Optional, Set, Tuple
 import structlog
 
 from .graph_execution_state import NodeExecutionStatus
+from .graph_kernels import build_csr, kahn_levels
+from .logging import is_debug_enabled
 
 logger = structlog.get_logger()
 
+# Statuses that keep a node out of the ready set
+_NOT_READY_STATUSES = frozenset({
+    NodeExecutionStatus.COMPLETED,
+    NodeExecutionStatus.RUNNING,
+    NodeExecutionStatus.FAILED,
+    NodeExecutionStatus.SKIPPED,
+})
+
 
 class CyclicDependencyError(Exception):
     """Raised when a cyclic dependency is detected in the graph."""
@@ -24,6 +37,7 @@ class GraphNode:
     
     Node Structure:
     - id: Unique identifier
+    - idx: Integer index, used as the node's bit in completion masks
     - component_type: Type of component to execute
     - config: Component configuration
     - inputs: Input connection mappings
@@ -31,8 +45,21 @@ class GraphNode:
     - dependents: Other nodes that depend on this node
     """
     
-    def __init__(self, node_id: str, component_type: str, config: Dict[str, Any] = None):
+    __slots__ = (
+        "id", "idx", "bit", "component_type", "config",
+        "inputs", "dependencies", "dependents", "status",
+    )
+    
+    def __init__(
+        self, 
+        node_id: str, 
+        component_type: str, 
+        config: Dict[str, Any] = None, 
+        idx: int = 0
+    ):
         self.id = node_id
+        self.idx = idx
+        self.bit = 1 << idx
         self.component_type = component_type
         self.config = config or {}
         self.inputs: Dict[str, Tuple[str, str]] = {}  # {input_name: (source_node_id, output_name)}
@@ -71,15 +98,53 @@ class GraphScheduler:
     def __init__(self):
         """Initialize graph scheduler."""
         self.nodes: Dict[str, GraphNode] = {}
+        self.all_mask = 0  # Bitset with one bit set per node
         self.logger = logger.bind(component="graph_scheduler")
+        # Checked once so graph building skips filtered debug calls entirely
+        self._debug_enabled = is_debug_enabled(self.logger)
+        
+        # Structure version, bumped on every add_node/add_edge; derived
+        # results are cached as (version, value) and reused while it matches
+        self._version = 0
+        self._sort_cache: Optional[Tuple[int, List[str]]] = None
+        self._max_depth_cache: Optional[Tuple[int, int]] = None
+        self._height_cache: Optional[Tuple[int, List[int]]] = None
+        
+        # Integer-indexed adjacency lists built by _freeze(), valid for _frozen_version
+        self._frozen_version = -1
+        self._ids: List[str] = []
+        self._idx: Dict[str, int] = {}
+        self._deps_adj: List[List[int]] = []
+        self._dependents_adj: List[List[int]] = []
+        self._dependents_csr: Tuple[List[int], List[int]] = ([0], [])
+        
+        # Read-only neighbour sets returned by the getters, valid for _frozen_sets_version
+        self._frozen_sets_version = -1
+        self._frozen_deps: Dict[str, FrozenSet[str]] = {}
+        self._frozen_dependents: Dict[str, FrozenSet[str]] = {}
+        
+        # Execution progress, set up by prepare() and indexed by node index:
+        # unfinished dependency counts, nodes whose dependencies have all
+        # completed, and completed node bits. _ready_heap orders ready nodes
+        # critical-path first as (-height, idx) and may hold stale entries for
+        # nodes that have since left _ready
+        self._remaining_deps: Optional[array] = None
+        self._ready: Set[int] = set()
+        self._ready_heap: List[Tuple[int, int]] = []
+        self._heights: List[int] = []
+        self.completed_mask = 0
     
     def add_node(self, node_id: str, component_type: str, config: Dict[str, Any] = None) -> None:
         """Add a node to the graph."""
         if node_id in self.nodes:
             raise ValueError(f"Node {node_id} already exists")
         
-        self.nodes[node_id] = GraphNode(node_id, component_type, config)
-        self.logger.debug("Node added to graph", node_id=node_id, component_type=component_type)
+        self.nodes[node_id] = GraphNode(node_id, component_type, config, idx=len(self.nodes))
+        self.all_mask = (1 << len(self.nodes)) - 1
+        self._version += 1
+        self._remaining_deps = None
+        if self._debug_enabled:
+            self.logger.debug("Node added to graph", node_id=node_id, component_type=component_type)
     
     def add_edge(self, source_node_id: str, output_name: str, target_node_id: str, input_name: str) -> None:
         """Add an edge (connection) between two nodes."""
@@ -95,20 +160,160 @@ class GraphScheduler:
         # Add dependent relationship to source node
         source_node = self.nodes[source_node_id]
         source_node.dependents.add(target_node_id)
+        self._version += 1
+        self._remaining_deps = None
+        
+        if self._debug_enabled:
+            self.logger.debug(
+                "Edge added to graph",
+                source=source_node_id,
+                target=target_node_id,
+                output=output_name,
+                input=input_name
+            )
+    
+    def clone(self) -> "GraphScheduler":
+        """
+        Return a scheduler for a new execution of the same graph.
+        
+        Node objects are copied so statuses are independent, while the
+        connection structures (inputs, dependencies, dependents) are shared.
+        The graph must therefore not be modified after it has been cloned.
+        """
+        scheduler = GraphScheduler.__new__(GraphScheduler)
+        scheduler.logger = self.logger
+        scheduler._debug_enabled = self._debug_enabled
+        scheduler.all_mask = self.all_mask
+        scheduler._version = self._version
+        scheduler._sort_cache = self._sort_cache
+        scheduler._max_depth_cache = self._max_depth_cache
+        scheduler._height_cache = self._height_cache
+        scheduler._frozen_version = self._frozen_version
+        scheduler._ids = self._ids
+        scheduler._idx = self._idx
+        scheduler._deps_adj = self._deps_adj
+        scheduler._dependents_adj = self._dependents_adj
+        scheduler._dependents_csr = self._dependents_csr
+        scheduler._frozen_sets_version = self._frozen_sets_version
+        scheduler._frozen_deps = self._frozen_deps
+        scheduler._frozen_dependents = self._frozen_dependents
+        scheduler.nodes = {}
+        
+        for node_id, node in self.nodes.items():
+            node_copy = copy.copy(node)
+            node_copy.status = NodeExecutionStatus.PENDING
+            scheduler.nodes[node_id] = node_copy
+        
+        scheduler.prepare()
+        return scheduler
+    
+    def _freeze(self) -> None:
+        """
+        Build integer-indexed adjacency lists for the current graph structure.
+        
+        Node i is ``self._ids[i]`` (insertion order, matching ``node.idx``);
+        ``_deps_adj[i]``/``_dependents_adj[i]`` hold neighbour indices, so the
+        traversals work on plain lists instead of hashing node IDs into sets.
+        Rebuilt only after the graph changes; dependencies on unknown nodes
+        are left out and reported by validate_graph.
+        """
+        if self._frozen_version == self._version:
+            return
+        
+        ids = list(self.nodes)
+        idx = {node_id: i for i, node_id in enumerate(ids)}
+        self._deps_adj = [
+            [idx[dep_id] for dep_id in self.nodes[node_id].dependencies if dep_id in idx]
+            for node_id in ids
+        ]
+        self._dependents_adj = [
+            [idx[dependent_id] for dependent_id in self.nodes[node_id].dependents]
+            for node_id in ids
+        ]
+        self._dependents_csr = build_csr(self._dependents_adj)
+        self._ids = ids
+        self._idx = idx
+        self._frozen_version = self._version
+    
+    def _freeze_sets(self) -> None:
+        """Snapshot every node's dependencies and dependents as frozensets for the getters."""
+        if self._frozen_sets_version == self._version:
+            return
+        
+        self._frozen_deps = {node_id: frozenset(node.dependencies) for node_id, node in self.nodes.items()}
+        self._frozen_dependents = {node_id: frozenset(node.dependents) for node_id, node in self.nodes.items()}
+        self._frozen_sets_version = self._version
+    
+    def prepare(self) -> None:
+        """
+        Reset execution progress from the current node statuses.
+        
+        Called lazily by get_ready_nodes/update_node_status after the graph
+        changes; afterwards readiness is maintained incrementally as nodes
+        complete instead of rescanning the graph.
+        """
+        self._freeze()
+        completed = NodeExecutionStatus.COMPLETED
+        nodes = list(self.nodes.values())
+        self.completed_mask = 0
+        self._ready = set()
+        self._ready_heap = []
+        
+        try:
+            self._heights = self._get_heights()
+        except CyclicDependencyError:
+            self._heights = [0] * len(nodes)  # No priorities; validate_graph reports the cycle
+        
+        is_completed = [node.status == completed for node in nodes]
+        for node in nodes:
+            if is_completed[node.idx]:
+                self.completed_mask |= node.bit
+        
+        self._remaining_deps = array("i", (
+            sum(1 for dep in deps if not is_completed[dep]) for deps in self._deps_adj
+        ))
+        
+        for node in nodes:
+            if self._remaining_deps[node.idx] == 0 and node.status not in _NOT_READY_STATUSES:
+                self._mark_ready(node.idx)
+    
+    def _mark_ready(self, idx: int) -> None:
+        """Add a node index to the ready set and the priority heap."""
+        self._ready.add(idx)
+        heapq.heappush(self._ready_heap, (-self._heights[idx], idx))
+    
+    def _get_heights(self) -> List[int]:
+        """
+        Return each node's height by index: the number of nodes on its longest
+        path to a sink, counting itself.
+        
+        Nodes on the critical path have the greatest height, so starting them
+        first shortens the overall run when there are more ready nodes than
+        workers. Cached until the graph structure changes.
+        """
+        if self._height_cache is None or self._height_cache[0] != self._version:
+            sorted_nodes = self._get_sorted_nodes()
+            idx = self._idx
+            dependents_adj = self._dependents_adj
+            heights = [0] * len(dependents_adj)
+            
+            # Reverse topological order: dependents are done before their dependencies
+            for node_id in reversed(sorted_nodes):
+                node = idx[node_id]
+                highest = 0
+                for dependent in dependents_adj[node]:
+                    if heights[dependent] > highest:
+                        highest = heights[dependent]
+                heights[node] = highest + 1
+            
+            self._height_cache = (self._version, heights)
         
-        self.logger.debug(
-            "Edge added to graph",
-            source=source_node_id,
-            target=target_node_id,
-            output=output_name,
-            input=input_name
-        )
+        return self._height_cache[1]
     
     def validate_graph(self) -> None:
         """Validate the graph for cycles and missing dependencies."""
-        # Check for cyclic dependencies
-        if self._has_cycles():
-            raise CyclicDependencyError("Graph contains cyclic dependencies")
+        # Check for cyclic dependencies (the order is cached for topological_sort)
+        self._get_sorted_nodes()
         
         # Validate all dependencies exist
         for node in self.nodes.values():
@@ -118,64 +323,76 @@ class GraphScheduler:
         
         self.logger.info("Graph validation completed", node_count=len(self.nodes))
     
-    def _has_cycles(self) -> bool:
-        """Check if the graph has cyclic dependencies using DFS."""
-        visited = set()
-        rec_stack = set()
-        
-        def dfs(node_id: str) -> bool:
-            visited.add(node_id)
-            rec_stack.add(node_id)
+    def _dfs_toposort(self) -> List[str]:
+        """
+        Sort nodes topologically and detect cycles in one iterative DFS.
+        
+        The DFS follows dependencies, so a node finishes after everything it
+        depends on and the finishing (post-)order is already a valid execution
+        order. Nodes are white (unvisited), gray (on the current path) or black
+        (finished); reaching a gray node again means a cycle. An explicit
+        stack of (node index, dependency iterator) frames over the frozen
+        adjacency lists replaces recursion, so deep chains can't hit the
+        recursion limit.
+        
+        Raises:
+            CyclicDependencyError: If the graph contains a cycle
+        """
+        self._freeze()
+        ids = self._ids
+        deps_adj = self._deps_adj
+        
+        WHITE, GRAY, BLACK = 0, 1, 2
+        color = bytearray(len(ids))  # All WHITE
+        order: List[int] = []
+        
+        for root in range(len(ids)):
+            if color[root] != WHITE:
+                continue
             
-            for dep_id in self.nodes[node_id].dependencies:
-                if dep_id not in visited:
-                    if dfs(dep_id):
-                        return True
-                elif dep_id in rec_stack:
-                    return True
+            color[root] = GRAY
+            stack: List[Tuple[int, Iterator[int]]] = [(root, iter(deps_adj[root]))]
             
-            rec_stack.remove(node_id)
-            return False
+            while stack:
+                node, deps = stack[-1]
+                dep = next(deps, -1)
+                
+                if dep < 0:
+                    color[node] = BLACK
+                    order.append(node)
+                    stack.pop()
+                    continue
+                
+                dep_color = color[dep]
+                if dep_color == GRAY:
+                    raise CyclicDependencyError(
+                        f"Graph contains cyclic dependencies: {ids[node]} depends on {ids[dep]}"
+                    )
+                if dep_color == WHITE:
+                    color[dep] = GRAY
+                    stack.append((dep, iter(deps_adj[dep])))
         
-        for node_id in self.nodes:
-            if node_id not in visited:
-                if dfs(node_id):
-                    return True
+        return [ids[i] for i in order]
+    
+    def _get_sorted_nodes(self) -> List[str]:
+        """Return the cached topological order, recomputing it after graph changes."""
+        if self._sort_cache is None or self._sort_cache[0] != self._version:
+            sorted_nodes = self._dfs_toposort()
+            self._sort_cache = (self._version, sorted_nodes)
+            self.logger.info("Topological sort completed", order=sorted_nodes)
         
-        return False
+        return self._sort_cache[1]
     
     def topological_sort(self) -> List[str]:
         """
-        Return nodes in topological order using Kahn's algorithm.
+        Return nodes in topological order.
+        
+        The order is cached until the graph structure changes.
         
         Returns:
             List of node IDs in execution order
         """
-        # Calculate in-degrees
-        in_degree = defaultdict(int)
-        for node in self.nodes.values():
-            for dep_id in node.dependencies:
-                in_degree[node.id] += 1
-        
-        # Initialize queue with nodes having no dependencies
-        queue = deque([node_id for node_id in self.nodes if in_degree[node_id] == 0])
-        sorted_nodes = []
-        
-        while queue:
-            node_id = queue.popleft()
-            sorted_nodes.append(node_id)
-            
-            # Update in-degrees of dependent nodes
-            for dependent_id in self.nodes[node_id].dependents:
-                in_degree[dependent_id] -= 1
-                if in_degree[dependent_id] == 0:
-                    queue.append(dependent_id)
-        
-        if len(sorted_nodes) != len(self.nodes):
-            raise CyclicDependencyError("Graph contains cycles")
-        
-        self.logger.info("Topological sort completed", order=sorted_nodes)
-        return sorted_nodes
+        return list(self._get_sorted_nodes())
     
     def get_execution_groups(self) -> List[List[str]]:
         """
@@ -184,78 +401,117 @@ class GraphScheduler:
         Returns:
             List of groups, where each group contains nodes that can run in parallel
         """
-        groups = []
-        remaining_nodes = set(self.nodes.keys())
-        
-        while remaining_nodes:
-            # Find nodes with no unsatisfied dependencies
-            ready_nodes = []
-            for node_id in remaining_nodes:
-                node = self.nodes[node_id]
-                unsatisfied_deps = node.dependencies.intersection(remaining_nodes)
-                if not unsatisfied_deps:
-                    ready_nodes.append(node_id)
-            
-            if not ready_nodes:
-                # Should not happen if graph is acyclic
-                raise CyclicDependencyError("No ready nodes found - possible cycle")
-            
-            groups.append(ready_nodes)
-            remaining_nodes -= set(ready_nodes)
+        self._freeze()
+        ids = self._ids
+        indptr, indices = self._dependents_csr
+        
+        # Layered Kahn's algorithm over the CSR dependents, compiled for large graphs
+        in_degree = [len(deps) for deps in self._deps_adj]
+        order, level_ptr, _ = kahn_levels(indptr, indices, in_degree)
+        
+        if len(order) != len(ids):
+            raise CyclicDependencyError("No ready nodes found - possible cycle")
+        
+        groups = [
+            [ids[i] for i in order[level_ptr[level]:level_ptr[level + 1]]]
+            for level in range(len(level_ptr) - 1)
+        ]
         
         self.logger.info("Execution groups created", group_count=len(groups))
         return groups
     
-    def get_ready_nodes(self, completed_nodes: Set[str]) -> List[str]:
+    def get_ready_nodes(self) -> List[str]:
         """
         Get nodes that are ready to execute based on completed dependencies.
         
-        Args:
-            completed_nodes: Set of node IDs that have completed execution
-            
         Returns:
-            List of node IDs ready for execution
+            List of node IDs whose dependencies have all completed and that
+            have not started yet, critical path first
         """
-        ready_nodes = []
+        if self._remaining_deps is None:
+            self.prepare()
         
-        for node_id, node in self.nodes.items():
-            if node.status in [NodeExecutionStatus.COMPLETED, NodeExecutionStatus.RUNNING]:
-                continue
-            
-            # Check if all dependencies are satisfied
-            if node.dependencies.issubset(completed_nodes):
-                ready_nodes.append(node_id)
+        heights = self._heights
+        ids = self._ids
+        return [ids[idx] for idx in sorted(self._ready, key=lambda idx: (-heights[idx], idx))]
+    
+    def next_ready(self) -> Optional[str]:
+        """
+        Return the ready node with the longest remaining path, or None.
+        
+        The node stays ready until its status changes, so callers should mark
+        it RUNNING before asking for the next one.
+        """
+        if self._remaining_deps is None:
+            self.prepare()
+        
+        # Drop entries of nodes that have left the ready set since being pushed
+        heap = self._ready_heap
+        while heap:
+            idx = heap[0][1]
+            if idx in self._ready:
+                return self._ids[idx]
+            heapq.heappop(heap)
         
-        return ready_nodes
+        return None
     
     def update_node_status(self, node_id: str, status: NodeExecutionStatus) -> None:
         """Update the execution status of a node."""
         if node_id not in self.nodes:
             raise ValueError(f"Node {node_id} not found")
+        if self._remaining_deps is None:
+            self.prepare()
+        
+        node = self.nodes[node_id]
+        idx = node.idx
+        previous_status = node.status
+        node.status = status
+        self._ready.discard(idx)
         
-        self.nodes[node_id].status = status
-        self.logger.debug("Node status updated", node_id=node_id, status=status.value)
+        if status == NodeExecutionStatus.COMPLETED:
+            if previous_status != NodeExecutionStatus.COMPLETED:
+                self.completed_mask |= node.bit
+                
+                # Release dependents whose last dependency just completed
+                remaining_deps = self._remaining_deps
+                for dependent in self._dependents_adj[idx]:
+                    remaining_deps[dependent] -= 1
+                    if remaining_deps[dependent] == 0:
+                        if self.nodes[self._ids[dependent]].status not in _NOT_READY_STATUSES:
+                            self._mark_ready(dependent)
+        elif status not in _NOT_READY_STATUSES and self._remaining_deps[idx] == 0:
+            self._mark_ready(idx)
+        
+        if self._debug_enabled:
+            self.logger.debug("Node status updated", node_id=node_id, status=status.value)
     
-    def get_node_dependencies(self, node_id: str) -> Set[str]:
-        """Get the dependencies of a specific node."""
+    def get_node_dependencies(self, node_id: str) -> FrozenSet[str]:
+        """Get the dependencies of a specific node (read-only, shared between calls)."""
         if node_id not in self.nodes:
             raise ValueError(f"Node {node_id} not found")
         
-        return self.nodes[node_id].dependencies.copy()
+        self._freeze_sets()
+        return self._frozen_deps[node_id]
     
-    def get_node_dependents(self, node_id: str) -> Set[str]:
-        """Get the nodes that depend on a specific node."""
+    def get_node_dependents(self, node_id: str) -> FrozenSet[str]:
+        """Get the nodes that depend on a specific node (read-only, shared between calls)."""
         if node_id not in self.nodes:
             raise ValueError(f"Node {node_id} not found")
         
-        return self.nodes[node_id].dependents.copy()
+        self._freeze_sets()
+        return self._frozen_dependents[node_id]
     
-    def get_node_inputs(self, node_id: str) -> Dict[str, Tuple[str, str]]:
-        """Get the input connections for a specific node."""
+    def get_node_inputs(self, node_id: str) -> Mapping[str, Tuple[str, str]]:
+        """
+        Get the input connections for a specific node.
+        
+        Returns a read-only view of the node's connections; it reflects later
+        add_edge calls, but must not be used to modify the graph.
+        """
         if node_id not in self.nodes:
             raise ValueError(f"Node {node_id} not found")
         
-        return self.nodes[node_id].inputs.copy()
+        return MappingProxyType(self.nodes[node_id].inputs)
     
     def get_graph_stats(self) -> Dict[str, Any]:
         """Get statistics about the graph structure."""
@@ -263,11 +519,15 @@ class GraphScheduler:
         total_edges = sum(len(node.dependencies) for node in self.nodes.values())
         
         # Calculate depth (longest path)
-        try:
-            sorted_nodes = self.topological_sort()
-            max_depth = self._calculate_max_depth(sorted_nodes)
-        except CyclicDependencyError:
-            max_depth = -1  # Indicates cycle
+        if self._max_depth_cache is not None and self._max_depth_cache[0] == self._version:
+            max_depth = self._max_depth_cache[1]
+        else:
+            try:
+                sorted_nodes = self._get_sorted_nodes()
+                max_depth = self._calculate_max_depth(sorted_nodes)
+            except CyclicDependencyError:
+                max_depth = -1  # Indicates cycle
+            self._max_depth_cache = (self._version, max_depth)
         
         return {
             "total_nodes": total_nodes,
@@ -279,13 +539,20 @@ class GraphScheduler:
     
     def _calculate_max_depth(self, sorted_nodes: List[str]) -> int:
         """Calculate the maximum depth of the graph."""
-        depths = {}
+        self._freeze()
+        idx = self._idx
+        deps_adj = self._deps_adj
+        depths = [0] * len(deps_adj)
         
+        # Single pass in topological order over integer indices
         for node_id in sorted_nodes:
-            node = self.nodes[node_id]
-            if not node.dependencies:
-                depths[node_id] = 0
-            else:
-                depths[node_id] = max(depths[dep_id] for dep_id in node.dependencies) + 1
+            node = idx[node_id]
+            deps = deps_adj[node]
+            if deps:
+                deepest = 0
+                for dep in deps:
+                    if depths[dep] > deepest:
+                        deepest = depths[dep]
+                depths[node] = deepest + 1
         
-        return max(depths.values()) if depths else 0
\ No newline at end of file
+        return max(depths) if depths else 0
@@ -3,8 +3,10 @@ Interactive Workflow Engine for real-time flow testing with user interaction
 """
 
 import asyncio
+import time
+from collections import defaultdict
 from typing import Dict, Any, Optional, Callable, List, Set
-from datetime import datetime
+from datetime import datetime, timedelta
 import structlog
 
 from src.core.workflow_engine import FlowNode, FlowEdge, Task, TaskStatus, DAGAnalyzer
@@ -13,6 +15,25 @@ from src.workers.base_worker import ExecutionContext
 
 logger = structlog.get_logger(__name__)
 
+# Streaming deltas are batched and sent at most this often, or sooner once
+# a node has this many characters buffered
+STREAM_FLUSH_INTERVAL = 0.03
+STREAM_FLUSH_MAX_CHARS = 4096
+
+
+def _output_extractor(source_handle: str) -> Callable[[Any], Any]:
+    """Build the function that picks a source handle's value out of a task result."""
+    def extract(result: Any) -> Any:
+        # Dict results expose named outputs, falling back to "output" or the whole result
+        if isinstance(result, dict):
+            if source_handle in result:
+                return result[source_handle]
+            if "output" in result:
+                return result["output"]
+        return result
+    
+    return extract
+
 
 class InteractiveOrchestrator:
     """Orchestrates interactive flow execution with user input support"""
@@ -28,7 +49,8 @@ class InteractiveOrchestrator:
         on_node_error: Callable = None,
         on_input_required: Callable = None,
         on_output: Callable = None,
-        on_streaming_update: Callable = None
+        on_streaming_update: Callable = None,
+        max_parallel: int = 8
     ):
         self.execution_id = execution_id
         self.flow_definition = flow_definition
@@ -51,10 +73,28 @@ class InteractiveOrchestrator:
         # Execution state
         self.tasks: Dict[str, Task] = {}
         self.completed_tasks: Set[str] = set()
-        self.user_inputs: Dict[str, asyncio.Event] = {}
         self.user_input_data: Dict[str, Any] = {}
         self.is_cancelled = False
         
+        # Wall-clock anchor taken once per run; tasks record monotonic_ns only
+        self.started_at: Optional[datetime] = None
+        self._started_ns = 0
+        
+        # Nodes waiting for user input share one condition; provide_input and
+        # cancel wake every waiter, each re-checks its own node
+        self._awaiting_input: Set[str] = set()
+        self._input_cv = asyncio.Condition()
+        
+        # Buffered streaming updates per node, sent by _flush_loop
+        self._stream_buf: Dict[str, Dict[str, Any]] = {}
+        self._stream_flush_task: Optional[asyncio.Task] = None
+        self._stream_lock = asyncio.Lock()
+        
+        # Number of tasks running at once; tasks waiting for the user hold
+        # the input lock so prompts don't overlap
+        self.max_parallel = max_parallel
+        self._input_lock = asyncio.Lock()
+        
     def _parse_nodes(self, nodes_data: List[dict]) -> Dict[str, FlowNode]:
         """Parse nodes from flow definition"""
         nodes = {}
@@ -90,38 +130,43 @@ class InteractiveOrchestrator:
         
     async def execute(self):
         """Execute the flow interactively"""
+        self.started_at = datetime.utcnow()
+        self._started_ns = time.monotonic_ns()
+        
         try:
             # Create tasks from nodes
             self._create_tasks()
             
-            # Get execution order
-            execution_order = self.dag.topological_sort()
+            # Prioritize by longest remaining path (also rejects cycles up front)
+            heights = self.dag.get_node_heights()
             
-            # Execute tasks in order
-            for node_id in execution_order:
-                if self.is_cancelled:
-                    break
-                    
-                task = self.tasks[node_id]
-                await self._execute_task(task)
+            await self._execute_ready_tasks(heights)
                 
         except Exception as e:
             logger.error("Flow execution failed", error=str(e))
             raise
+        
+        finally:
+            # Send whatever streaming output is still buffered
+            await self._flush_streaming_updates()
             
     def _create_tasks(self):
         """Create tasks from nodes"""
+        # Index edges by target once instead of scanning all edges per node
+        incoming_edges: Dict[str, List[FlowEdge]] = defaultdict(list)
+        for edge in self.edges:
+            incoming_edges[edge.target].append(edge)
+        
         for node_id, node in self.nodes.items():
             # Get dependencies and input mappings
             dependencies = []
             input_mappings = {}
             
-            for edge in self.edges:
-                if edge.target == node_id:
-                    dependencies.append(edge.source)
-                    target_handle = edge.target_handle or "input"
-                    source_handle = edge.source_handle or "output"
-                    input_mappings[target_handle] = (edge.source, source_handle)
+            for edge in incoming_edges[node_id]:
+                dependencies.append(edge.source)
+                target_handle = edge.target_handle or "input"
+                source_handle = edge.source_handle or "output"
+                input_mappings[target_handle] = (edge.source, source_handle)
                     
             task = Task(
                 id=f"task_{node_id}",
@@ -134,6 +179,86 @@ class InteractiveOrchestrator:
             )
             
             self.tasks[node_id] = task
+        
+        # Resolve input sources once, now that every task exists
+        for task in self.tasks.values():
+            task.input_resolvers = [
+                (target_handle, self.tasks[source_node_id], _output_extractor(source_handle))
+                for target_handle, (source_node_id, source_handle) in task.input_mappings.items()
+                if source_node_id in self.tasks
+            ]
+            
+    async def _execute_ready_tasks(self, heights: Dict[str, int]):
+        """
+        Execute tasks as soon as their dependencies complete.
+        
+        A task whose last dependency finishes is queued immediately, so the
+        flow is paced by its critical path rather than by layer barriers.
+        Ready tasks are taken highest first (see DAGAnalyzer.get_node_heights).
+        After a failure no new tasks are started; running ones finish and
+        the first error is raised.
+        """
+        remaining = {node_id: len(deps) for node_id, deps in self.dag.reverse_adjacency_list.items()}
+        if not remaining:
+            return
+        
+        # Entries are (-height, creation order, node_id)
+        queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        order = {node_id: i for i, node_id in enumerate(remaining)}
+        for node_id, count in remaining.items():
+            if count == 0:
+                queue.put_nowait((-heights[node_id], order[node_id], node_id))
+        
+        errors: List[Exception] = []
+        
+        async def worker():
+            while True:
+                _, _, node_id = await queue.get()
+                try:
+                    if errors or self.is_cancelled:
+                        continue
+                    
+                    await self._run_scheduled_task(self.tasks[node_id])
+                    
+                    # Queue dependents whose dependencies are all done
+                    for dependent_id in self.dag.adjacency_list[node_id]:
+                        remaining[dependent_id] -= 1
+                        if remaining[dependent_id] == 0:
+                            queue.put_nowait((-heights[dependent_id], order[dependent_id], dependent_id))
+                except Exception as e:
+                    errors.append(e)
+                finally:
+                    queue.task_done()
+        
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.max_parallel, len(remaining)))]
+        try:
+            await queue.join()
+        finally:
+            for worker_task in workers:
+                worker_task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        
+        if errors:
+            raise errors[0]
+    
+    async def _run_scheduled_task(self, task: Task):
+        """Execute a task, serializing the ones that wait for user input"""
+        if self._requires_user_input(self.nodes[task.node_id]):
+            async with self._input_lock:
+                await self._execute_task(task)
+        else:
+            await self._execute_task(task)
+    
+    @staticmethod
+    def _requires_user_input(node: FlowNode) -> bool:
+        """Whether a node has to wait for user input before it can run"""
+        if node.type != "input" and not node.data.get("requiresUserInput"):
+            return False
+        
+        # Skip user input if default value is provided
+        config = node.data.get("config", {})
+        has_default = config.get("default_value") or config.get("input_value")
+        return not has_default
             
     async def _execute_task(self, task: Task):
         """Execute a single task"""
@@ -149,18 +274,14 @@ class InteractiveOrchestrator:
                 
             # Update task status
             task.status = TaskStatus.RUNNING
-            task.started_at = datetime.utcnow()
+            task.started_ns = time.monotonic_ns()
             
             # Gather inputs from dependencies
             task.inputs = await self._gather_task_inputs(task)
             
             # Check if node requires user input
-            if node.type == "input" or node.data.get("requiresUserInput"):
-                # Skip user input if default value is provided
-                config = node.data.get("config", {})
-                has_default = config.get("default_value") or config.get("input_value")
-                if not has_default:
-                    await self._handle_user_input(task)
+            if self._requires_user_input(node):
+                await self._handle_user_input(task)
                 
             # Execute the task
             worker = get_worker(task.node_type)
@@ -193,7 +314,7 @@ class InteractiveOrchestrator:
                 raise ValueError(f"No worker found for node type: {task.node_type}")
                 
             # Update task completion
-            task.completed_at = datetime.utcnow()
+            self._finish_task_timing(task)
             self.completed_tasks.add(task.node_id)
             
             # Notify node complete
@@ -203,7 +324,7 @@ class InteractiveOrchestrator:
         except Exception as e:
             task.status = TaskStatus.FAILED
             task.error = str(e)
-            task.completed_at = datetime.utcnow()
+            self._finish_task_timing(task)
             
             # Notify node error
             if self.on_node_error:
@@ -212,33 +333,31 @@ class InteractiveOrchestrator:
             logger.error("Task execution failed", task_id=task.id, error=str(e))
             raise
             
+    def _wall_clock(self, monotonic_ns: Optional[int]) -> Optional[datetime]:
+        """Convert a monotonic reading from this run to a wall-clock datetime."""
+        if monotonic_ns is None or self.started_at is None:
+            return None
+        return self.started_at + timedelta(microseconds=(monotonic_ns - self._started_ns) // 1000)
+        
+    def _finish_task_timing(self, task: Task) -> None:
+        """Record a task's completion and fill its started_at/completed_at from the monotonic readings"""
+        task.completed_ns = time.monotonic_ns()
+        task.started_at = self._wall_clock(task.started_ns)
+        task.completed_at = self._wall_clock(task.completed_ns)
+        
     async def _gather_task_inputs(self, task: Task) -> Dict[str, Any]:
         """Gather inputs for a task from its dependencies"""
-        inputs = {}
-        
-        for target_handle, (source_node_id, source_handle) in task.input_mappings.items():
-            source_task = self.tasks.get(source_node_id)
-            if source_task and source_task.result:
-                # Get the specific output from the source task
-                if isinstance(source_task.result, dict):
-                    if source_handle in source_task.result:
-                        inputs[target_handle] = source_task.result[source_handle]
-                    elif "output" in source_task.result:
-                        inputs[target_handle] = source_task.result["output"]
-                    else:
-                        inputs[target_handle] = source_task.result
-                else:
-                    inputs[target_handle] = source_task.result
-                    
-        return inputs
+        return {
+            target_handle: extract(source_task.result)
+            for target_handle, source_task, extract in task.input_resolvers
+            if source_task.result
+        }
         
     async def _handle_user_input(self, task: Task):
         """Handle user input requirement for a task"""
         node = self.nodes[task.node_id]
         
-        # Create event for waiting on user input
-        event = asyncio.Event()
-        self.user_inputs[task.node_id] = event
+        self._awaiting_input.add(task.node_id)
         
         # Notify that input is required
         if self.on_input_required:
@@ -255,27 +374,36 @@ class InteractiveOrchestrator:
             await self.on_input_required(task.node_id, input_schema)
             
         # Wait for user input
-        await event.wait()
+        try:
+            async with self._input_cv:
+                await self._input_cv.wait_for(
+                    lambda: task.node_id in self.user_input_data or self.is_cancelled
+                )
+        finally:
+            self._awaiting_input.discard(task.node_id)
         
         # Get the provided input
         if task.node_id in self.user_input_data:
-            task.inputs.update(self.user_input_data[task.node_id])
-            del self.user_input_data[task.node_id]
+            task.inputs.update(self.user_input_data.pop(task.node_id))
             
     async def provide_input(self, node_id: str, input_data: dict):
         """Provide user input for a waiting node"""
-        if node_id in self.user_inputs:
-            self.user_input_data[node_id] = input_data
-            self.user_inputs[node_id].set()
-            del self.user_inputs[node_id]
+        if node_id in self._awaiting_input:
+            async with self._input_cv:
+                self.user_input_data[node_id] = input_data
+                self._input_cv.notify_all()
             
     async def cancel(self):
         """Cancel the execution"""
-        self.is_cancelled = True
+        async with self._input_cv:
+            self.is_cancelled = True
+            
+            # Wake any waiting user inputs
+            self._input_cv.notify_all()
         
-        # Clear any waiting user inputs
-        for event in self.user_inputs.values():
-            event.set()
+        if self._stream_flush_task:
+            self._stream_flush_task.cancel()
+            self._stream_flush_task = None
             
     async def emit_streaming_update(
         self, 
@@ -286,22 +414,60 @@ class InteractiveOrchestrator:
         accumulated: str = "",
         is_complete: bool = False
     ):
-        """Emit streaming update for real-time response"""
-        if self.on_streaming_update:
-            try:
-                await self.on_streaming_update(
-                    node_id=node_id,
-                    update_data={
-                        "node_type": node_type,
-                        "node_label": node_label,
-                        "delta": delta,
-                        "accumulated": accumulated,
-                        "is_complete": is_complete
-                    }
-                )
-            except Exception as e:
-                logger.warning(
-                    "Failed to emit streaming update",
-                    node_id=node_id,
-                    error=str(e)
-                )
\ No newline at end of file
+        """
+        Emit streaming update for real-time response
+        
+        Deltas are buffered per node and sent in batches by a background flush
+        loop; the final update of a node is sent immediately.
+        """
+        if not self.on_streaming_update:
+            return
+        
+        buffered = self._stream_buf.get(node_id)
+        if buffered is None:
+            buffered = self._stream_buf[node_id] = {"deltas": [], "size": 0}
+        buffered["node_type"] = node_type
+        buffered["node_label"] = node_label
+        buffered["accumulated"] = accumulated
+        buffered["is_complete"] = is_complete
+        if delta:
+            buffered["deltas"].append(delta)
+            buffered["size"] += len(delta)
+        
+        if is_complete or buffered["size"] >= STREAM_FLUSH_MAX_CHARS:
+            await self._flush_streaming_updates(node_id)
+        elif self._stream_flush_task is None or self._stream_flush_task.done():
+            self._stream_flush_task = asyncio.create_task(self._flush_loop())
+            
+    async def _flush_loop(self):
+        """Send buffered streaming updates periodically until the buffer drains"""
+        while self._stream_buf:
+            await asyncio.sleep(STREAM_FLUSH_INTERVAL)
+            await self._flush_streaming_updates()
+            
+    async def _flush_streaming_updates(self, node_id: Optional[str] = None):
+        """Send buffered streaming updates, for one node or all of them"""
+        # Serialized so a node's batches are delivered in order
+        async with self._stream_lock:
+            node_ids = [node_id] if node_id is not None else list(self._stream_buf)
+            for buffered_node_id in node_ids:
+                buffered = self._stream_buf.pop(buffered_node_id, None)
+                if buffered is None:
+                    continue
+                try:
+                    await self.on_streaming_update(
+                        node_id=buffered_node_id,
+                        update_data={
+                            "node_type": buffered["node_type"],
+                            "node_label": buffered["node_label"],
+                            "delta": "".join(buffered["deltas"]),
+                            "accumulated": buffered["accumulated"],
+                            "is_complete": buffered["is_complete"]
+                        }
+                    )
+                except Exception as e:
+                    logger.warning(
+                        "Failed to emit streaming update",
+                        node_id=buffered_node_id,
+                        error=str(e)
+                    )
@@ -6,6 +6,7 @@ import logging
 import sys
 from typing import Any, Dict
 
+import orjson
 import structlog
 from structlog.processors import CallsiteParameter
 
@@ -14,14 +15,21 @@ from src.config.settings import get_settings
 settings = get_settings()
 
 
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    """JSON serializer for the structlog renderer; stdlib handlers need str, not bytes."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, **kwargs).decode()
+
+
 def setup_logging() -> None:
     """Configure structured logging for the application."""
     
+    log_level = getattr(logging, settings.LOG_LEVEL.upper())
+    
     # Configure standard logging
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
-        level=getattr(logging, settings.LOG_LEVEL.upper()),
+        level=log_level,
     )
     
     # Processors for structlog
@@ -32,20 +40,28 @@ def setup_logging() -> None:
         structlog.stdlib.PositionalArgumentsFormatter(),
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
-        structlog.processors.CallsiteParameterAdder(
-            parameters=[
-                CallsiteParameter.FILENAME,
-                CallsiteParameter.LINENO,
-                CallsiteParameter.FUNC_NAME,
-            ]
-        ),
+    ]
+    
+    # Callsite lookup walks the stack on every record, so only pay for it when debugging
+    if log_level <= logging.DEBUG:
+        processors.append(
+            structlog.processors.CallsiteParameterAdder(
+                parameters=[
+                    CallsiteParameter.FILENAME,
+                    CallsiteParameter.LINENO,
+                    CallsiteParameter.FUNC_NAME,
+                ]
+            )
+        )
+    
+    processors += [
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
     ]
     
     # Add appropriate renderer based on format setting
     if settings.LOG_FORMAT == "json":
-        processors.append(structlog.processors.JSONRenderer())
+        processors.append(structlog.processors.JSONRenderer(serializer=_orjson_dumps))
     else:
         processors.append(structlog.dev.ConsoleRenderer())
     
@@ -54,11 +70,24 @@ def setup_logging() -> None:
         processors=processors,
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
+        # Drops records below the level before any processor runs
+        wrapper_class=structlog.make_filtering_bound_logger(log_level),
         cache_logger_on_first_use=True,
     )
 
 
+def is_debug_enabled(logger: Any) -> bool:
+    """
+    Whether debug records would be emitted by a logger.
+    
+    Filtering bound loggers expose is_enabled_for (older structlog: isEnabledFor);
+    when neither exists assume debug is on, so records are never lost.
+    """
+    is_enabled_for = (getattr(logger, "isEnabledFor", None)
+                      or getattr(logger, "is_enabled_for", None))
+    return is_enabled_for(logging.DEBUG) if is_enabled_for else True
+
+
 def get_logger(name: str | None = None, **kwargs: Any) -> structlog.BoundLogger:
     """Get a configured logger instance."""
     logger = structlog.get_logger(name)
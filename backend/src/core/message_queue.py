@@ -4,22 +4,58 @@ Flow: Producer -> Exchange -> Queue -> Consumer -> Task Execution
 """
 
 import asyncio
-import json
-from typing import Dict, Any, Optional, Callable
-from datetime import datetime
-from dataclasses import dataclass, asdict
+import sys
+import weakref
+from typing import Dict, Any, List, Optional, Callable
+from datetime import datetime, timedelta
+from dataclasses import dataclass
 
 import aio_pika
 from aio_pika import Message, ExchangeType
+from aio_pika.pool import Pool
+import orjson
 import structlog
 
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
 from src.config.settings import get_settings
+from src.workers import node_registry, WorkerPool
+from src.workers.base_worker import ExecutionContext
 
 logger = structlog.get_logger(__name__)
 settings = get_settings()
 
+# Task deliveries are acked in batches of this size, or after this many seconds
+BATCH_ACK_SIZE = 32
+BATCH_ACK_INTERVAL = 0.05
+
+# Backoff delays (seconds) for failed tasks; each has a TTL queue that
+# dead-letters back to the task queue once the delay has passed
+RETRY_DELAYS = (2, 4, 8, 16, 32, 60)
+
+# Naive datetimes in payloads are UTC; results may carry non-string dict keys
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+# TaskMessage fields carried by AMQP properties (message_id, timestamp) or x-death
+# headers rather than repeated in MessagePack task bodies
+_TASK_PROPERTY_FIELDS = ("task_id", "created_at", "retry_count")
+
+
+def _msgpack_default(value: Any) -> Any:
+    """Encode values msgpack has no type for the way orjson would with ORJSON_OPTIONS."""
+    if isinstance(value, datetime):
+        # Naive and UTC datetimes get a "Z" suffix (OPT_NAIVE_UTC | OPT_UTC_Z)
+        if value.tzinfo is None or value.utcoffset() == timedelta(0):
+            return value.replace(tzinfo=None).isoformat() + "Z"
+        return value.isoformat()
+    return str(value)
 
-@dataclass
+
+@dataclass(slots=True)
 class TaskMessage:
     """Message format for task execution."""
     task_id: str
@@ -33,6 +69,121 @@ class TaskMessage:
     created_at: str
     retry_count: int = 0
     max_retries: int = 3
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the message fields; unlike asdict() it doesn't deep-copy config/inputs."""
+        return {
+            "task_id": self.task_id,
+            "execution_id": self.execution_id,
+            "flow_id": self.flow_id,
+            "node_id": self.node_id,
+            "node_type": self.node_type,
+            "config": self.config,
+            "inputs": self.inputs,
+            "dependencies": self.dependencies,
+            "created_at": self.created_at,
+            "retry_count": self.retry_count,
+            "max_retries": self.max_retries,
+        }
+
+
+class AckBatcher:
+    """
+    Acknowledges consumed messages in batches.
+    
+    Deliveries finished below the oldest one still being processed form a
+    contiguous run that is settled with one ``ack(multiple=True)``, so a batch
+    ack never settles in-flight deliveries. Deliveries that finish out of order,
+    behind a slow one, are acked individually on the flush timer so they don't
+    hold up the prefetch window. Failed messages are rejected individually
+    right away.
+    
+    Delivery tags are per channel: call ``reset()`` when the channel closes.
+    Deliveries from before the reset are then neither acked nor rejected, and
+    the broker redelivers them.
+    """
+    
+    def __init__(self, batch_size: int = BATCH_ACK_SIZE, interval: float = BATCH_ACK_INTERVAL):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._in_flight: Dict[int, aio_pika.IncomingMessage] = {}
+        self._done: Dict[int, aio_pika.IncomingMessage] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    def track(self, message: aio_pika.IncomingMessage) -> None:
+        """Record a delivery whose processing has started."""
+        self._in_flight[message.delivery_tag] = message
+    
+    def _untrack(self, message: aio_pika.IncomingMessage) -> bool:
+        """Stop tracking a delivery; False if it came from a channel since reset."""
+        if self._in_flight.get(message.delivery_tag) is not message:
+            return False
+        del self._in_flight[message.delivery_tag]
+        return True
+    
+    async def done(self, message: aio_pika.IncomingMessage) -> None:
+        """Mark a delivery as processed; acks go out per batch or after the interval."""
+        if not self._untrack(message):
+            return
+        self._done[message.delivery_tag] = message
+        
+        if len(self._done) >= self.batch_size:
+            await self._ack_contiguous()
+        self._schedule_flush()
+    
+    async def reject(self, message: aio_pika.IncomingMessage) -> None:
+        """Reject a failed delivery on its own so it is dead-lettered."""
+        if not self._untrack(message):
+            return
+        await message.reject(requeue=False)
+        
+        # The watermark may have moved past deliveries waiting on this one
+        if self._done:
+            await self._ack_contiguous()
+            self._schedule_flush()
+    
+    async def flush(self) -> None:
+        """Ack every processed delivery: the contiguous run at once, the rest one by one."""
+        await self._ack_contiguous()
+        
+        out_of_order = list(self._done.values())
+        self._done.clear()
+        for message in out_of_order:
+            await message.ack()
+    
+    async def _ack_contiguous(self) -> None:
+        """Ack processed deliveries older than the oldest in-flight one with a single ack."""
+        watermark = min(self._in_flight) if self._in_flight else None
+        ackable = [tag for tag in self._done if watermark is None or tag < watermark]
+        if not ackable:
+            return
+        
+        last_tag = max(ackable)
+        message = self._done[last_tag]
+        for tag in ackable:
+            del self._done[tag]
+        await message.ack(multiple=True)
+    
+    def _schedule_flush(self) -> None:
+        if self._done and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_later())
+    
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.interval)
+        await self.flush()
+    
+    def reset(self, *_: Any) -> None:
+        """Forget all delivery tags; used as a channel close callback."""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._in_flight.clear()
+        self._done.clear()
+    
+    async def close(self) -> None:
+        """Send outstanding acks and stop the flush timer."""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        await self.flush()
 
 
 class MessageQueue:
@@ -40,8 +191,15 @@ class MessageQueue:
     
     def __init__(self):
         self.connection: Optional[aio_pika.Connection] = None
+        # Declarations and consumers use self.channel; publishers borrow from the pool
         self.channel: Optional[aio_pika.Channel] = None
+        self.channel_pool: Optional[Pool] = None
         self.exchange: Optional[aio_pika.Exchange] = None
+        self.exchange_name = "flowstudio"
+        # Exchange handle per pooled channel, resolved once when the channel opens
+        self._pool_exchanges: "weakref.WeakKeyDictionary[aio_pika.Channel, aio_pika.Exchange]" = (
+            weakref.WeakKeyDictionary()
+        )
         self.logger = structlog.get_logger(__name__)
         
         # Queue names
@@ -49,24 +207,43 @@ class MessageQueue:
         self.result_queue_name = "flowstudio.results"
         self.dlq_name = "flowstudio.tasks.dlq"  # Dead Letter Queue
         
+        # Queue handles on self.channel, kept from _create_queues
+        self.task_queue: Optional[aio_pika.Queue] = None
+        self.result_queue: Optional[aio_pika.Queue] = None
+        self.dlq: Optional[aio_pika.Queue] = None
+        
         # Consumer callback
         self.task_consumer_callback: Optional[Callable] = None
+        self._ack_batchers: List[AckBatcher] = []
     
     async def connect(self) -> None:
         """Connect to RabbitMQ."""
+        if sys.platform == "linux" and not type(asyncio.get_running_loop()).__module__.startswith("uvloop"):
+            logger.warning(
+                "Not running on uvloop; RabbitMQ throughput will be lower",
+                hint="pip install uvloop, or start through an entrypoint that installs it",
+            )
+        
         try:
             self.connection = await aio_pika.connect_robust(
                 settings.RABBITMQ_URL,
                 heartbeat=600,
                 blocked_connection_timeout=300,
+                # Names the connection in the management UI and broker logs
+                client_properties={"connection_name": "flowstudio"},
             )
             
-            self.channel = await self.connection.channel()
-            await self.channel.set_qos(prefetch_count=10)
+            # Publishes wait for broker confirms, which batch publishes await together
+            self.channel = await self.connection.channel(publisher_confirms=True)
+            await self.channel.set_qos(
+                prefetch_count=settings.RABBITMQ_PREFETCH_COUNT,
+                prefetch_size=0,
+                global_=False
+            )
             
             # Create exchange
             self.exchange = await self.channel.declare_exchange(
-                "flowstudio",
+                self.exchange_name,
                 ExchangeType.TOPIC,
                 durable=True
             )
@@ -74,12 +251,26 @@ class MessageQueue:
             # Create queues
             await self._create_queues()
             
+            self.channel_pool = Pool(self._create_channel, max_size=settings.RABBITMQ_CHANNEL_POOL_SIZE)
+            
             self.logger.info("Connected to RabbitMQ", url=settings.RABBITMQ_URL)
             
         except Exception as e:
             self.logger.error("Failed to connect to RabbitMQ", error=str(e))
             raise
     
+    async def _create_channel(self) -> aio_pika.Channel:
+        """Open a publishing channel for the channel pool."""
+        channel = await self.connection.channel(publisher_confirms=True)
+        # The exchange is declared in connect(); skip the passive re-declare
+        self._pool_exchanges[channel] = await channel.get_exchange(self.exchange_name, ensure=False)
+        return channel
+    
+    async def _publish(self, message: Message, routing_key: str) -> None:
+        """Publish a message on a pooled channel so concurrent publishes don't queue on one channel."""
+        async with self.channel_pool.acquire() as channel:
+            await self._pool_exchanges[channel].publish(message, routing_key=routing_key)
+    
     async def _create_queues(self) -> None:
         """Create necessary queues."""
         if not self.channel or not self.exchange:
@@ -97,7 +288,7 @@ class MessageQueue:
             self.task_queue_name,
             durable=True,
             arguments={
-                "x-dead-letter-exchange": "flowstudio",
+                "x-dead-letter-exchange": self.exchange_name,
                 "x-dead-letter-routing-key": "tasks.failed",
                 "x-message-ttl": 3600000,  # 1 hour TTL
             }
@@ -114,23 +305,58 @@ class MessageQueue:
         await result_queue.bind(self.exchange, "tasks.result")
         await dlq.bind(self.exchange, "tasks.failed")
         
+        self.task_queue = task_queue
+        self.result_queue = result_queue
+        self.dlq = dlq
+        
+        # Delayed retry queues, consumed by nobody: expired messages go back to tasks.execute
+        for delay in RETRY_DELAYS:
+            retry_queue = await self.channel.declare_queue(
+                f"{self.task_queue_name}.retry.{delay}s",
+                durable=True,
+                arguments={
+                    "x-dead-letter-exchange": self.exchange_name,
+                    "x-dead-letter-routing-key": "tasks.execute",
+                    "x-message-ttl": delay * 1000,
+                }
+            )
+            await retry_queue.bind(self.exchange, f"retry.{delay}s")
+        
         self.logger.info("Queues created and bound")
     
     async def disconnect(self) -> None:
         """Disconnect from RabbitMQ."""
         if self.connection and not self.connection.is_closed:
+            for acks in self._ack_batchers:
+                await acks.close()
+            if self.channel_pool:
+                await self.channel_pool.close()
             await self.connection.close()
             self.logger.info("Disconnected from RabbitMQ")
     
-    async def publish_task(self, task_message: TaskMessage) -> None:
-        """Publish a task to the queue."""
-        if not self.exchange:
-            raise RuntimeError("Exchange not initialized")
+    def _build_task_message(self, task_message: TaskMessage) -> Message:
+        """
+        Build the AMQP message for a task.
         
-        message_body = json.dumps(asdict(task_message))
-        message = Message(
-            message_body.encode(),
-            content_type="application/json",
+        The body is JSON unless RABBITMQ_MSGPACK_TASKS is on; enable it only once
+        every worker has msgpack installed and understands the compact body.
+        """
+        body = task_message.to_dict()
+        
+        if settings.RABBITMQ_MSGPACK_TASKS:
+            if not MSGPACK_AVAILABLE:
+                raise RuntimeError("RABBITMQ_MSGPACK_TASKS is enabled but msgpack is not installed")
+            for name in _TASK_PROPERTY_FIELDS:
+                del body[name]
+            payload = msgpack.packb(body, use_bin_type=True, default=_msgpack_default)
+            content_type = "application/msgpack"
+        else:
+            payload = orjson.dumps(body, option=ORJSON_OPTIONS)
+            content_type = "application/json"
+        
+        return Message(
+            payload,
+            content_type=content_type,
             headers={
                 "task_id": task_message.task_id,
                 "execution_id": task_message.execution_id,
@@ -140,18 +366,69 @@ class MessageQueue:
             message_id=task_message.task_id,
             timestamp=datetime.utcnow(),
         )
+    
+    def _decode_task_message(self, message: aio_pika.IncomingMessage) -> TaskMessage:
+        """Rebuild a TaskMessage from a delivery's body and properties."""
+        if message.content_type == "application/msgpack":
+            if not MSGPACK_AVAILABLE:
+                raise ValueError("Received a MessagePack task but msgpack is not installed")
+            task_data = msgpack.unpackb(message.body, raw=False)
+        else:
+            task_data = orjson.loads(message.body)
         
-        await self.exchange.publish(
-            message,
-            routing_key="tasks.execute"
-        )
+        # JSON messages still carry these in the body
+        task_data.setdefault("task_id", message.message_id)
+        if "created_at" not in task_data:
+            task_data["created_at"] = message.timestamp.isoformat() if message.timestamp else ""
+        task_message = TaskMessage(**task_data)
         
-        self.logger.info(
+        # Attempts so far come from the broker's x-death records and retry_count header
+        task_message.retry_count = self._delivery_retry_count(message)
+        return task_message
+    
+    async def publish_task(self, task_message: TaskMessage) -> None:
+        """Publish a task to the queue."""
+        if not self.exchange:
+            raise RuntimeError("Exchange not initialized")
+        
+        message = self._build_task_message(task_message)
+        
+        await self._publish(message, routing_key="tasks.execute")
+        
+        self.logger.debug(
             "Task published to queue",
             task_id=task_message.task_id,
             node_type=task_message.node_type
         )
     
+    async def publish_tasks_batch(self, task_messages: List[TaskMessage]) -> None:
+        """
+        Publish several tasks at once.
+        
+        All messages are sent on the pooled channels together and their publisher
+        confirms are awaited collectively instead of one round-trip per task.
+        """
+        if not self.exchange:
+            raise RuntimeError("Exchange not initialized")
+        if not task_messages:
+            return
+        
+        messages = [self._build_task_message(task_message) for task_message in task_messages]
+        if len(messages) == 1:
+            # Chained nodes release one successor at a time; awaiting the publish
+            # directly skips wrapping it in a task and a trip through the loop
+            await self._publish(messages[0], routing_key="tasks.execute")
+        else:
+            await asyncio.gather(*(
+                self._publish(message, routing_key="tasks.execute")
+                for message in messages
+            ))
+        
+        self.logger.debug(
+            "Task batch published to queue",
+            task_count=len(task_messages)
+        )
+    
     async def publish_result(self, task_id: str, execution_id: str, 
                            result: Dict[str, Any], success: bool = True) -> None:
         """Publish task result."""
@@ -163,95 +440,164 @@ class MessageQueue:
             "execution_id": execution_id,
             "result": result,
             "success": success,
-            "completed_at": datetime.utcnow().isoformat()
+            "completed_at": datetime.utcnow()
         }
         
         message = Message(
-            json.dumps(result_message).encode(),
+            orjson.dumps(result_message, option=ORJSON_OPTIONS),
             content_type="application/json",
             headers={"task_id": task_id, "execution_id": execution_id},
         )
         
-        await self.exchange.publish(
-            message,
-            routing_key="tasks.result"
-        )
+        await self._publish(message, routing_key="tasks.result")
         
-        self.logger.info(
+        self.logger.debug(
             "Result published",
             task_id=task_id,
             success=success
         )
     
-    async def start_task_consumer(self, callback: Callable[[TaskMessage], Any]) -> None:
-        """Start consuming tasks from the queue."""
+    async def start_task_consumer(self, callback: Callable[[TaskMessage], Any],
+                                  prefetch: Optional[int] = None) -> None:
+        """
+        Start consuming tasks from the queue.
+        
+        Args:
+            callback: Coroutine called with each TaskMessage
+            prefetch: Prefetch count for this consumer; when given, the consumer
+                gets its own channel so long-running executors can take fewer
+                unacked tasks than RABBITMQ_PREFETCH_COUNT
+        """
         if not self.channel:
             raise RuntimeError("Channel not initialized")
         
         self.task_consumer_callback = callback
         
-        task_queue = await self.channel.get_queue(self.task_queue_name)
+        task_queue = self.task_queue
+        channel = self.channel
+        if prefetch is not None:
+            channel = await self.connection.channel()
+            await channel.set_qos(prefetch_count=prefetch, prefetch_size=0, global_=False)
+            task_queue = await channel.get_queue(self.task_queue_name)
+        elif task_queue is None:
+            task_queue = await self.channel.get_queue(self.task_queue_name)
+        
+        # A batch must fit in the prefetch window or the consumer waits on the timer
+        effective_prefetch = prefetch if prefetch is not None else settings.RABBITMQ_PREFETCH_COUNT
+        acks = AckBatcher(batch_size=max(1, min(BATCH_ACK_SIZE, effective_prefetch // 2)))
+        self._ack_batchers.append(acks)
+        # Delivery tags restart when the channel is reopened after a connection loss
+        channel.close_callbacks.add(acks.reset)
         
         async def process_message(message: aio_pika.IncomingMessage) -> None:
-            async with message.process():
-                try:
-                    # Parse message
-                    task_data = json.loads(message.body.decode())
-                    task_message = TaskMessage(**task_data)
-                    
-                    self.logger.info(
-                        "Processing task",
-                        task_id=task_message.task_id,
-                        node_type=task_message.node_type
-                    )
-                    
-                    # Execute callback
-                    await callback(task_message)
-                    
-                except json.JSONDecodeError as e:
-                    self.logger.error("Failed to decode message", error=str(e))
-                    # Message will be rejected and sent to DLQ
-                    raise
-                    
-                except Exception as e:
-                    self.logger.error(
-                        "Task processing failed",
-                        task_id=task_data.get("task_id", "unknown"),
-                        error=str(e)
-                    )
-                    
-                    # Check retry count
-                    retry_count = task_data.get("retry_count", 0)
-                    max_retries = task_data.get("max_retries", 3)
-                    
-                    if retry_count < max_retries:
-                        # Retry the task
-                        task_data["retry_count"] = retry_count + 1
-                        await self._retry_task(TaskMessage(**task_data))
-                    else:
-                        # Send to DLQ
-                        self.logger.error(
-                            "Task failed after max retries",
-                            task_id=task_data.get("task_id"),
-                            retry_count=retry_count
-                        )
-                    raise
+            acks.track(message)
+            try:
+                await handle_message(message)
+            except Exception:
+                await acks.reject(message)
+                raise
+            await acks.done(message)
+        
+        async def handle_message(message: aio_pika.IncomingMessage) -> None:
+            try:
+                # Parse message
+                task_message = self._decode_task_message(message)
+            except (ValueError, TypeError) as e:
+                self.logger.error("Failed to decode message", error=str(e))
+                # Message will be rejected and sent to DLQ
+                raise
+            
+            try:
+                self.logger.debug(
+                    "Processing task",
+                    task_id=task_message.task_id,
+                    node_type=task_message.node_type
+                )
+                
+                # Execute callback
+                await callback(task_message)
+                
+            except Exception as e:
+                self.logger.error(
+                    "Task processing failed",
+                    task_id=task_message.task_id,
+                    error=str(e)
+                )
+                
+                # Check retry count
+                retry_count = task_message.retry_count
+                max_retries = task_message.max_retries
+                
+                if retry_count < max_retries:
+                    # Retry the task; the original delivery is acked, not dead-lettered
+                    await self._retry_task(message, retry_count + 1)
+                    return
+                
+                # Rejected below and sent to DLQ
+                self.logger.error(
+                    "Task failed after max retries",
+                    task_id=task_message.task_id,
+                    retry_count=retry_count
+                )
+                raise
         
         await task_queue.consume(process_message)
-        self.logger.info("Task consumer started")
+        self.logger.info(
+            "Task consumer started",
+            prefetch=effective_prefetch,
+            ack_batch_size=acks.batch_size
+        )
+    
+    def _delivery_retry_count(self, message: aio_pika.IncomingMessage) -> int:
+        """
+        Number of retries this delivery has been through.
+        
+        Counts the times the broker expired it out of a retry queue (x-death)
+        and also reads the retry_count header _retry_task sets, taking the
+        larger, so the retry bound holds even if x-death is lost or reset.
+        """
+        headers = message.headers or {}
+        retry_queue_prefix = f"{self.task_queue_name}.retry."
+        x_death_count = sum(
+            death.get("count", 0)
+            for death in headers.get("x-death") or []
+            if death.get("reason") == "expired"
+            and str(death.get("queue", "")).startswith(retry_queue_prefix)
+        )
+        try:
+            header_count = int(headers.get("retry_count") or 0)
+        except (TypeError, ValueError):
+            header_count = 0
+        return max(x_death_count, header_count)
     
-    async def _retry_task(self, task_message: TaskMessage) -> None:
-        """Retry a failed task with exponential backoff."""
-        # Wait before retrying (exponential backoff)
-        delay = min(2 ** task_message.retry_count, 60)  # Max 60 seconds
-        await asyncio.sleep(delay)
+    async def _retry_task(self, message: aio_pika.IncomingMessage, retry_count: int) -> None:
+        """
+        Retry a failed task with exponential backoff.
+        
+        The original body and headers are parked in the retry queue for the
+        delay and the broker re-routes them to the task queue when the TTL
+        expires, recording the attempt in x-death. Nothing is re-encoded and
+        the consumer is free again immediately.
+        """
+        # Exponential backoff, capped at the longest retry queue
+        delay = next(
+            (d for d in RETRY_DELAYS if d >= 2 ** retry_count),
+            RETRY_DELAYS[-1]
+        )
         
-        await self.publish_task(task_message)
+        retry_message = Message(
+            message.body,
+            content_type=message.content_type,
+            headers={**(message.headers or {}), "retry_count": retry_count},
+            message_id=message.message_id,
+            timestamp=message.timestamp,
+        )
+        await self._publish(retry_message, routing_key=f"retry.{delay}s")
         
         self.logger.info(
             "Task retried",
-            task_id=task_message.task_id,
-            retry_count=task_message.retry_count,
+            task_id=message.message_id,
+            retry_count=retry_count,
             delay=delay
         )
     
@@ -287,6 +633,18 @@ class MessageQueue:
             return {}
 
 
+# Shared by every queued task in this process, created on first use
+_worker_pool: Optional[WorkerPool] = None
+
+
+def get_worker_pool() -> WorkerPool:
+    """Get the process-wide worker pool for queued tasks."""
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = WorkerPool(max_workers=settings.WORKER_POOL_SIZE)
+    return _worker_pool
+
+
 class QueuedTaskExecutor:
     """Task executor that uses message queue."""
     
@@ -296,9 +654,6 @@ class QueuedTaskExecutor:
     
     async def execute_task_from_queue(self, task_message: TaskMessage) -> None:
         """Execute a task received from the queue."""
-        from src.workers import node_registry, WorkerPool
-        from src.workers.base_worker import ExecutionContext
-        
         try:
             # Get executor for node type
             executor = node_registry.get_executor(task_message.node_type)
@@ -313,8 +668,7 @@ class QueuedTaskExecutor:
             )
             
             # Execute task
-            worker_pool = WorkerPool(max_workers=5)
-            result = await worker_pool.execute_task(
+            result = await get_worker_pool().execute_task(
                 executor=executor,
                 config=task_message.config,
                 inputs=task_message.inputs,
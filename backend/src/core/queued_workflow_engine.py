@@ -4,17 +4,21 @@ Flow: Flow Definition -> DAG Analysis -> Task Publishing -> Queue Processing ->
 """
 
 import asyncio
+import itertools
 import uuid
-from datetime import datetime
-from typing import Dict, List, Any, Set, Optional
 from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Any, Set, Optional, Tuple
+from dataclasses import dataclass
 
+import orjson
 import structlog
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.workflow_engine import (
     DAGAnalyzer, FlowNode, FlowEdge, Task, TaskStatus, 
-    WorkflowOrchestrator as BaseOrchestrator
+    WorkflowOrchestrator as BaseOrchestrator, get_flow_graph
 )
 from src.core.message_queue import MessageQueue, TaskMessage, QueuedTaskExecutor
 from src.models.execution import Execution, ExecutionStatus
@@ -23,6 +27,44 @@ from src.core.database import AsyncSessionLocal
 
 logger = structlog.get_logger(__name__)
 
+# Terminal execution updates are committed together, up to this many per
+# transaction or whatever arrived within this many seconds
+DB_WRITE_BATCH_SIZE = 50
+DB_WRITE_INTERVAL = 0.1
+
+# Backoff delays (seconds) before retrying an update whose batch failed
+DB_WRITE_RETRY_DELAYS = (0.5, 1, 2, 4)
+
+
+@dataclass(slots=True)
+class ExecutionUpdate:
+    """Terminal status of an execution, waiting to be written by the DB writer."""
+    execution_id: str
+    status: ExecutionStatus
+    completed_at: datetime
+    outputs: Optional[Dict[str, Any]] = None
+    error_message: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ExecutionState:
+    """State of one queued flow execution while its tasks are in flight."""
+    tasks: Dict[str, Task]
+    dag: DAGAnalyzer
+    flow_id: str
+    started_at: datetime
+    # task_id -> (node_id, task) so results are matched in O(1)
+    task_by_id: Dict[str, Tuple[str, Task]]
+    # Successors per node and unfinished dependency counts, so a
+    # result only touches the nodes that depend on it
+    successors: Dict[str, Tuple[str, ...]]
+    pending_deps: Dict[str, int]
+    # Results and completion flags indexed by node_index[node_id]
+    node_index: Dict[str, int]
+    results: List[Any]
+    completed: bytearray
+    completed_count: int = 0
+
 
 class QueuedWorkflowOrchestrator(BaseOrchestrator):
     """Workflow orchestrator that uses message queues for task distribution."""
@@ -31,47 +73,51 @@ class QueuedWorkflowOrchestrator(BaseOrchestrator):
         super().__init__()
         self.mq = message_queue
         self.executor = QueuedTaskExecutor(message_queue)
-        self.active_executions: Dict[str, Dict[str, Any]] = {}
-        self.task_results: Dict[str, Dict[str, Any]] = defaultdict(dict)
+        self.active_executions: Dict[str, ExecutionState] = {}
         self.result_consumer_started = False
+        # Task IDs are message IDs shared with other replicas and later restarts:
+        # a random per-process prefix keeps the cheap counter from repeating
+        self._task_id_prefix = uuid.uuid4().hex[:12]
+        self._task_seq = itertools.count()
+        # Write-behind queue for terminal execution updates, drained by _db_writer
+        self._db_queue: asyncio.Queue = asyncio.Queue()
+        self._db_writer_task: Optional[asyncio.Task] = None
     
     async def execute_flow(self, execution_id: str) -> None:
         """Execute a flow using message queue."""
         async with AsyncSessionLocal() as db:
             try:
                 # Get execution and flow data
-                execution = await self._get_execution(db, execution_id)
+                execution, flow_version = await self._get_execution_with_flow_version(db, execution_id)
                 if not execution:
                     raise ValueError(f"Execution {execution_id} not found")
                 
-                flow_version = await self._get_flow_version(db, execution.flow_id)
                 if not flow_version or not flow_version.definition:
                     raise ValueError(f"Flow definition not found for execution {execution_id}")
                 
-                # Update execution status
+                # Update execution status; committed now so clients see it while the flow runs
                 await self._update_execution_status(db, execution_id, ExecutionStatus.RUNNING)
+                await db.commit()
                 
-                # Parse flow definition
-                flow_def = flow_version.definition
-                nodes = [FlowNode(**node) for node in flow_def.get('nodes', [])]
-                edges = [FlowEdge(**edge) for edge in flow_def.get('edges', [])]
-                
-                # Analyze DAG
-                dag = DAGAnalyzer(nodes, edges)
-                if not dag.validate_dag():
-                    raise ValueError("Flow contains cycles - not a valid DAG")
+                # Parse flow definition and analyze DAG (cached per version)
+                nodes, edges, dag = get_flow_graph(flow_version)
                 
                 # Create tasks
                 tasks = self._create_tasks(nodes, edges, execution.inputs or {})
                 
                 # Store execution state
-                self.active_executions[execution_id] = {
-                    "tasks": tasks,
-                    "dag": dag,
-                    "completed_nodes": set(),
-                    "started_at": datetime.utcnow(),
-                    "flow_id": execution.flow_id
-                }
+                self.active_executions[execution_id] = ExecutionState(
+                    tasks=tasks,
+                    dag=dag,
+                    flow_id=execution.flow_id,
+                    started_at=datetime.utcnow(),
+                    task_by_id={task.id: (node_id, task) for node_id, task in tasks.items()},
+                    successors=self._build_successors(tasks),
+                    pending_deps={node_id: len(task.dependencies) for node_id, task in tasks.items()},
+                    node_index={node_id: idx for idx, node_id in enumerate(tasks)},
+                    results=[None] * len(tasks),
+                    completed=bytearray(len(tasks))
+                )
                 
                 # Start result consumer if not already started
                 if not self.result_consumer_started:
@@ -82,7 +128,10 @@ class QueuedWorkflowOrchestrator(BaseOrchestrator):
                 
             except Exception as e:
                 self.logger.error("Queued workflow execution failed", execution_id=execution_id, error=str(e))
+                # Discard whatever the failed step left in the transaction before recording the failure
+                await db.rollback()
                 await self._fail_execution(db, execution_id, str(e))
+                await db.commit()
                 raise
     
     async def start_result_consumer(self) -> None:
@@ -90,13 +139,12 @@ class QueuedWorkflowOrchestrator(BaseOrchestrator):
         if not self.mq.channel:
             raise RuntimeError("Message queue not connected")
         
-        result_queue = await self.mq.channel.get_queue(self.mq.result_queue_name)
+        result_queue = self.mq.result_queue or await self.mq.channel.get_queue(self.mq.result_queue_name)
         
         async def process_result(message) -> None:
             async with message.process():
                 try:
-                    import json
-                    result_data = json.loads(message.body.decode())
+                    result_data = orjson.loads(message.body)
                     await self._handle_task_result(result_data)
                 except Exception as e:
                     self.logger.error("Failed to process result", error=str(e))
@@ -109,44 +157,50 @@ class QueuedWorkflowOrchestrator(BaseOrchestrator):
     async def _schedule_initial_tasks(self, execution_id: str) -> None:
         """Schedule initial tasks that have no dependencies."""
         execution_state = self.active_executions[execution_id]
-        dag = execution_state["dag"]
-        tasks = execution_state["tasks"]
-        completed_nodes = execution_state["completed_nodes"]
         
         # Get initial executable nodes
-        executable_nodes = dag.get_executable_nodes(completed_nodes)
+        batch = [
+            task for node_id, task in execution_state.tasks.items()
+            if execution_state.pending_deps[node_id] == 0
+        ]
         
-        for node_id in executable_nodes:
-            task = tasks[node_id]
-            await self._publish_task(execution_id, task)
+        await self._publish_tasks(execution_id, batch)
     
-    async def _publish_task(self, execution_id: str, task: Task) -> None:
-        """Publish a task to the message queue."""
+    async def _publish_tasks(self, execution_id: str, batch: List[Task]) -> None:
+        """Publish a batch of tasks to the message queue in one go."""
+        if not batch:
+            return
+        
         execution_state = self.active_executions[execution_id]
+        created_at = datetime.utcnow().isoformat()
         
-        task_message = TaskMessage(
-            task_id=task.id,
-            execution_id=execution_id,
-            flow_id=execution_state["flow_id"],
-            node_id=task.node_id,
-            node_type=task.node_type,
-            config=task.config,
-            inputs=task.inputs,
-            dependencies=task.dependencies,
-            created_at=datetime.utcnow().isoformat()
-        )
+        task_messages = [
+            TaskMessage(
+                task_id=task.id,
+                execution_id=execution_id,
+                flow_id=execution_state.flow_id,
+                node_id=task.node_id,
+                node_type=task.node_type,
+                config=task.config,
+                inputs=task.inputs,
+                dependencies=task.dependencies,
+                created_at=created_at
+            )
+            for task in batch
+        ]
         
-        await self.mq.publish_task(task_message)
+        await self.mq.publish_tasks_batch(task_messages)
         
         # Update task status
-        task.status = TaskStatus.RUNNING
-        task.started_at = datetime.utcnow()
+        started_at = datetime.utcnow()
+        for task in batch:
+            task.status = TaskStatus.RUNNING
+            task.started_at = started_at
         
-        self.logger.info(
-            "Task published to queue",
+        self.logger.debug(
+            "Tasks published to queue",
             execution_id=execution_id,
-            task_id=task.id,
-            node_type=task.node_type
+            task_ids=[task.id for task in batch]
         )
     
     async def _handle_task_result(self, result_data: Dict[str, Any]) -> None:
@@ -161,31 +215,28 @@ class QueuedWorkflowOrchestrator(BaseOrchestrator):
             return
         
         execution_state = self.active_executions[execution_id]
-        tasks = execution_state["tasks"]
-        dag = execution_state["dag"]
-        completed_nodes = execution_state["completed_nodes"]
         
         # Find the task and node
-        task = None
-        node_id = None
-        for nid, t in tasks.items():
-            if t.id == task_id:
-                task = t
-                node_id = nid
-                break
+        node_id, task = execution_state.task_by_id.get(task_id, (None, None))
         
         if not task:
             self.logger.warning("Received result for unknown task", task_id=task_id)
             return
         
+        idx = execution_state.node_index[node_id]
+        if execution_state.completed[idx]:
+            # Redelivered result; its successors were already released
+            return
+        
         # Update task status
         task.completed_at = datetime.utcnow()
         
         if success:
             task.status = TaskStatus.COMPLETED
             task.result = result
-            self.task_results[execution_id][node_id] = result
-            completed_nodes.add(node_id)
+            execution_state.results[idx] = result
+            execution_state.completed[idx] = 1
+            execution_state.completed_count += 1
             
             self.logger.info(
                 "Task completed successfully",
@@ -195,7 +246,7 @@ class QueuedWorkflowOrchestrator(BaseOrchestrator):
             )
             
             # Schedule next tasks
-            await self._schedule_next_tasks(execution_id)
+            await self._schedule_next_tasks(execution_id, node_id)
             
         else:
             task.status = TaskStatus.FAILED
@@ -209,87 +260,197 @@ class QueuedWorkflowOrchestrator(BaseOrchestrator):
             )
             
             # Fail the entire execution
-            async with AsyncSessionLocal() as db:
-                await self._fail_execution(db, execution_id, f"Task {task_id} failed: {task.error}")
+            self._enqueue_update(ExecutionUpdate(
+                execution_id=execution_id,
+                status=ExecutionStatus.FAILED,
+                completed_at=datetime.utcnow(),
+                error_message=f"Task {task_id} failed: {task.error}"
+            ))
             
             # Clean up execution state
             if execution_id in self.active_executions:
                 del self.active_executions[execution_id]
     
-    async def _schedule_next_tasks(self, execution_id: str) -> None:
-        """Schedule next available tasks."""
+    async def _schedule_next_tasks(self, execution_id: str, completed_node_id: str) -> None:
+        """Schedule the tasks whose last dependency was the node that just completed."""
         execution_state = self.active_executions[execution_id]
-        dag = execution_state["dag"]
-        tasks = execution_state["tasks"]
-        completed_nodes = execution_state["completed_nodes"]
-        
-        # Get newly executable nodes
-        executable_nodes = dag.get_executable_nodes(completed_nodes)
+        tasks = execution_state.tasks
+        pending_deps = execution_state.pending_deps
         
-        # Filter out already running/completed tasks
+        # Only successors of the completed node can have become executable
         newly_executable = []
-        for node_id in executable_nodes:
-            task = tasks[node_id]
-            if task.status == TaskStatus.PENDING:
+        for node_id in execution_state.successors[completed_node_id]:
+            pending_deps[node_id] -= 1
+            if pending_deps[node_id] == 0 and tasks[node_id].status == TaskStatus.PENDING:
                 newly_executable.append(node_id)
         
         # Schedule new tasks
+        batch = []
+        node_index = execution_state.node_index
+        results = execution_state.results
+        completed = execution_state.completed
         for node_id in newly_executable:
             task = tasks[node_id]
-            # Prepare inputs from completed dependencies
-            task_inputs = task.inputs.copy() if task.inputs else {}
-            for dep_node_id in task.dependencies:
-                if dep_node_id in self.task_results[execution_id]:
-                    task_inputs[dep_node_id] = self.task_results[execution_id][dep_node_id]
-            
-            task.inputs = task_inputs
-            await self._publish_task(execution_id, task)
+            # Prepare inputs from completed dependencies; results are referenced, not copied,
+            # and the task's own inputs are only merged in when it has any
+            dep_results = {
+                dep_node_id: results[node_index[dep_node_id]]
+                for dep_node_id in task.dependencies
+                if completed[node_index[dep_node_id]]
+            }
+            task.inputs = {**task.inputs, **dep_results} if task.inputs else dep_results
+            batch.append(task)
+        
+        await self._publish_tasks(execution_id, batch)
         
         # Check if workflow is complete
-        if len(completed_nodes) == len(tasks):
+        if execution_state.completed_count == len(tasks):
             await self._complete_workflow(execution_id)
     
     async def _complete_workflow(self, execution_id: str) -> None:
         """Complete the workflow execution."""
         execution_state = self.active_executions[execution_id]
-        results = self.task_results[execution_id]
+        results = dict(zip(execution_state.node_index, execution_state.results))
         
-        async with AsyncSessionLocal() as db:
-            await self._complete_execution(db, execution_id, results)
+        self._enqueue_update(ExecutionUpdate(
+            execution_id=execution_id,
+            status=ExecutionStatus.COMPLETED,
+            completed_at=datetime.utcnow(),
+            outputs=results
+        ))
         
         # Clean up state
         del self.active_executions[execution_id]
-        if execution_id in self.task_results:
-            del self.task_results[execution_id]
         
         self.logger.info(
             "Workflow completed",
             execution_id=execution_id,
-            duration=(datetime.utcnow() - execution_state["started_at"]).total_seconds()
+            duration=(datetime.utcnow() - execution_state.started_at).total_seconds()
         )
     
+    def _enqueue_update(self, update: ExecutionUpdate) -> None:
+        """Queue a terminal execution update for the DB writer."""
+        self._db_queue.put_nowait(update)
+        if self._db_writer_task is None or self._db_writer_task.done():
+            self._db_writer_task = asyncio.create_task(self._db_writer())
+    
+    async def _db_writer(self) -> None:
+        """Commit queued execution updates in batches until the queue drains."""
+        loop = asyncio.get_running_loop()
+        while not self._db_queue.empty():
+            batch = [self._db_queue.get_nowait()]
+            deadline = loop.time() + DB_WRITE_INTERVAL
+            while len(batch) < DB_WRITE_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._db_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await self._write_updates(batch)
+            except Exception as e:
+                self.logger.warning(
+                    "Batched execution update failed, writing individually",
+                    execution_ids=[update.execution_id for update in batch],
+                    error=str(e)
+                )
+                for update in batch:
+                    await self._write_update_with_retry(update)
+    
+    async def _write_update_with_retry(self, update: ExecutionUpdate) -> None:
+        """
+        Write one execution update, retrying with backoff.
+        
+        If a completed execution's outputs still can't be stored, the execution
+        is marked failed instead so it never stays RUNNING.
+        """
+        for delay in (*DB_WRITE_RETRY_DELAYS, None):
+            try:
+                await self._write_updates([update])
+                return
+            except Exception as e:
+                error = e
+                if delay is not None:
+                    await asyncio.sleep(delay)
+        
+        if update.status == ExecutionStatus.COMPLETED:
+            self.logger.error(
+                "Failed to store execution outputs, marking execution failed",
+                execution_id=update.execution_id,
+                error=str(error)
+            )
+            await self._write_update_with_retry(ExecutionUpdate(
+                execution_id=update.execution_id,
+                status=ExecutionStatus.FAILED,
+                completed_at=update.completed_at,
+                error_message=f"Failed to store execution outputs: {error}"
+            ))
+        else:
+            self.logger.error(
+                "Failed to write execution update",
+                execution_id=update.execution_id,
+                status=update.status,
+                error=str(error)
+            )
+    
+    async def _write_updates(self, batch: List[ExecutionUpdate]) -> None:
+        """Apply a batch of execution updates in one transaction."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Execution).where(Execution.id.in_([update.execution_id for update in batch]))
+            )
+            executions = {execution.id: execution for execution in result.scalars()}
+            
+            for update in batch:
+                execution = executions.get(update.execution_id)
+                if not execution:
+                    continue
+                execution.status = update.status
+                execution.completed_at = update.completed_at
+                if update.status == ExecutionStatus.COMPLETED:
+                    execution.outputs = update.outputs
+                else:
+                    execution.error_message = update.error_message
+            
+            await db.commit()
+    
+    async def close(self) -> None:
+        """Write any execution updates still queued."""
+        if self._db_writer_task and not self._db_writer_task.done():
+            await self._db_writer_task
+    
+    @staticmethod
+    def _build_successors(tasks: Dict[str, Task]) -> Dict[str, Tuple[str, ...]]:
+        """Map each node to the nodes that depend on it, one entry per dependency."""
+        successors: Dict[str, List[str]] = {node_id: [] for node_id in tasks}
+        for node_id, task in tasks.items():
+            for dep_node_id in task.dependencies:
+                successors[dep_node_id].append(node_id)
+        # Frozen once; scheduling only ever iterates them
+        return {node_id: tuple(nodes) for node_id, nodes in successors.items()}
+    
     def _create_tasks(self, nodes: List[FlowNode], edges: List[FlowEdge], flow_inputs: Dict[str, Any]) -> Dict[str, Task]:
         """Create tasks with unique IDs for queue processing."""
-        tasks = {}
-        
         # Build dependency map
-        dependencies = {node.id: [] for node in nodes}
+        dependencies: Dict[str, List[str]] = defaultdict(list)
         for edge in edges:
             dependencies[edge.target].append(edge.source)
         
-        for node in nodes:
-            task_id = f"task_{node.id}_{uuid.uuid4().hex[:8]}"
-            task = Task(
-                id=task_id,
+        return {
+            node.id: Task(
+                id=f"task_{node.id}_{self._task_id_prefix}{next(self._task_seq):08x}",
                 node_id=node.id,
                 node_type=node.type,
                 config=node.data,
                 inputs=flow_inputs if node.type == 'input' else {},
-                dependencies=dependencies[node.id]
+                dependencies=dependencies[node.id],
+                input_mappings={}
             )
-            tasks[node.id] = task
-        
-        return tasks
+            for node in nodes
+        }
 
 
 # Create global instance (will be initialized with message queue)
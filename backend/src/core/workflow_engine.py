@@ -4,19 +4,35 @@ Flow: Flow Definition -> DAG Analysis -> Task Scheduling -> Execution
 """
 
 import asyncio
+import hashlib
+import heapq
+from collections import OrderedDict, defaultdict
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Set
-from dataclasses import dataclass
+from typing import Callable, Dict, List, Any, Optional, Set, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
+import orjson
 import structlog
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.execution import Execution, ExecutionStatus
 from src.models.flow import Flow, FlowVersion
 from src.core.database import AsyncSessionLocal
+from src.core.graph_kernels import build_csr, kahn_levels
+from src.config.settings import get_settings
+from src.workers import node_registry, WorkerPool
+from src.workers.base_worker import ExecutionContext
 
 logger = structlog.get_logger(__name__)
+settings = get_settings()
+
+# Parsed and validated flow graphs kept per flow version (LRU)
+DAG_CACHE_SIZE = 128
+
+# Results of nodes that opt in with config["memoize"], keyed by content hash (LRU)
+MEMO_CACHE_SIZE = 1024
 
 
 class TaskStatus(str, Enum):
@@ -28,7 +44,7 @@ class TaskStatus(str, Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FlowNode:
     """Represents a node in the flow."""
     id: str
@@ -37,7 +53,7 @@ class FlowNode:
     position: Dict[str, float]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FlowEdge:
     """Represents an edge/connection between nodes."""
     id: str
@@ -47,7 +63,7 @@ class FlowEdge:
     target_handle: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Represents an executable task."""
     id: str
@@ -62,6 +78,20 @@ class Task:
     error: Optional[str] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    # time.monotonic_ns() readings, for engines that time tasks without wall-clock datetimes
+    started_ns: Optional[int] = None
+    completed_ns: Optional[int] = None
+    # (target_handle, source task, extractor) built once by orchestrators that pre-resolve inputs
+    input_resolvers: List[Tuple[str, "Task", Callable[[Any], Any]]] = field(
+        default_factory=list, repr=False, compare=False
+    )
+    
+    @property
+    def duration_ms(self) -> Optional[float]:
+        """Task run time in milliseconds from the monotonic counters, if finished."""
+        if self.started_ns is None or self.completed_ns is None:
+            return None
+        return (self.completed_ns - self.started_ns) / 1_000_000
 
 
 class DAGAnalyzer:
@@ -72,6 +102,14 @@ class DAGAnalyzer:
         self.edges = edges
         self.adjacency_list = self._build_adjacency_list()
         self.reverse_adjacency_list = self._build_reverse_adjacency_list()
+        self.indegree = {node_id: len(deps) for node_id, deps in self.reverse_adjacency_list.items()}
+        
+        # Integer view of the graph (node index -> dependents in CSR form), built on first sort
+        self._node_ids: List[str] = list(self.nodes)
+        self._dependents_csr: Optional[Tuple[List[int], List[int]]] = None
+        self._topological_order: Optional[List[str]] = None
+        self._execution_groups: Optional[List[List[str]]] = None
+        self._descendant_counts: Optional[Dict[str, int]] = None
     
     def _build_adjacency_list(self) -> Dict[str, List[str]]:
         """Build adjacency list for forward dependencies."""
@@ -88,30 +126,92 @@ class DAGAnalyzer:
         return rev_adj_list
     
     def topological_sort(self) -> List[str]:
-        """Return nodes in topological order."""
-        visited = set()
-        temp_visited = set()
-        result = []
+        """
+        Return nodes in topological order (Kahn's algorithm, no recursion).
         
-        def dfs(node_id: str):
-            if node_id in temp_visited:
-                raise ValueError(f"Cycle detected involving node {node_id}")
-            if node_id in visited:
-                return
-            
-            temp_visited.add(node_id)
-            for neighbor in self.adjacency_list[node_id]:
-                dfs(neighbor)
-            
-            temp_visited.remove(node_id)
-            visited.add(node_id)
-            result.insert(0, node_id)
+        The order is computed once and reused, so validating the DAG and
+        later traversals share a single pass over the graph.
+        """
+        self._sort()
+        return list(self._topological_order)
+    
+    def get_execution_groups(self) -> List[List[str]]:
+        """Group nodes into layers whose members only depend on earlier layers."""
+        self._sort()
+        return [list(group) for group in self._execution_groups]
+    
+    def _sort(self) -> None:
+        """
+        Sort the graph once on integer node indices, raising ValueError on a cycle.
         
-        for node_id in self.nodes.keys():
-            if node_id not in visited:
-                dfs(node_id)
+        Node IDs are mapped to indices and the dependents flattened into CSR
+        arrays, so the sort (see graph_kernels.kahn_levels) indexes lists
+        instead of hashing strings; IDs are translated back only for the result.
+        """
+        if self._topological_order is not None:
+            return
         
-        return result
+        node_ids = self._node_ids
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        indptr, indices = build_csr([
+            [index[neighbor] for neighbor in self.adjacency_list[node_id]]
+            for node_id in node_ids
+        ])
+        order, level_ptr, remaining = kahn_levels(
+            indptr, indices, [self.indegree[node_id] for node_id in node_ids]
+        )
+        
+        if len(order) != len(node_ids):
+            cyclic = next(i for i, degree in enumerate(remaining) if degree > 0)
+            raise ValueError(f"Cycle detected involving node {node_ids[cyclic]}")
+        
+        self._dependents_csr = (indptr, indices)
+        self._topological_order = [node_ids[i] for i in order]
+        self._execution_groups = [
+            self._topological_order[level_ptr[level]:level_ptr[level + 1]]
+            for level in range(len(level_ptr) - 1)
+        ]
+    
+    def get_node_heights(self) -> Dict[str, int]:
+        """
+        Number of nodes on each node's longest path to a sink, counting itself.
+        
+        Starting the highest nodes first keeps the critical path moving when
+        more nodes are ready than can run at once.
+        """
+        heights: Dict[str, int] = {}
+        for group in reversed(self.get_execution_groups()):
+            for node_id in group:
+                heights[node_id] = 1 + max(
+                    (heights[neighbor] for neighbor in self.adjacency_list[node_id]),
+                    default=0
+                )
+        return heights
+    
+    def get_descendant_counts(self) -> Dict[str, int]:
+        """
+        Number of nodes downstream of each node, computed once per DAG.
+        
+        Starting the nodes that unblock the most work first avoids a high
+        fan-out node finishing last and serializing everything after it.
+        """
+        if self._descendant_counts is None:
+            self._sort()
+            indptr, indices = self._dependents_csr
+            node_ids = self._node_ids
+            index = {node_id: i for i, node_id in enumerate(node_ids)}
+            # Descendant sets as int bitsets, folded in reverse topological order
+            descendants = [0] * len(node_ids)
+            for node_id in reversed(self._topological_order):
+                i = index[node_id]
+                bits = 0
+                for j in indices[indptr[i]:indptr[i + 1]]:
+                    bits |= descendants[j] | (1 << j)
+                descendants[i] = bits
+            self._descendant_counts = {
+                node_ids[i]: bits.bit_count() for i, bits in enumerate(descendants)
+            }
+        return self._descendant_counts
     
     def get_executable_nodes(self, completed_nodes: Set[str]) -> List[str]:
         """Get nodes that are ready to execute."""
@@ -137,59 +237,92 @@ class DAGAnalyzer:
             return False
 
 
+FlowGraph = Tuple[List[FlowNode], List[FlowEdge], DAGAnalyzer]
+
+_dag_cache: "OrderedDict[Tuple[str, str], FlowGraph]" = OrderedDict()
+
+
+def get_flow_graph(flow_version: FlowVersion) -> FlowGraph:
+    """
+    Parse and validate a flow version's definition, reusing earlier results.
+    
+    A version's definition is never edited in place, so the parsed nodes, edges
+    and analyzed DAG are cached by version. Callers must treat them as read-only.
+    """
+    key = (flow_version.flow_id, flow_version.id)
+    graph = _dag_cache.get(key)
+    if graph is not None:
+        _dag_cache.move_to_end(key)
+        return graph
+    
+    flow_def = flow_version.definition
+    nodes = [FlowNode(**node) for node in flow_def.get('nodes', [])]
+    edges = [FlowEdge(**edge) for edge in flow_def.get('edges', [])]
+    
+    dag = DAGAnalyzer(nodes, edges)
+    if not dag.validate_dag():
+        raise ValueError("Flow contains cycles - not a valid DAG")
+    
+    graph = (nodes, edges, dag)
+    _dag_cache[key] = graph
+    if len(_dag_cache) > DAG_CACHE_SIZE:
+        _dag_cache.popitem(last=False)
+    return graph
+
+
 class WorkflowOrchestrator:
     """Main orchestrator for workflow execution."""
     
     def __init__(self):
         self.logger = structlog.get_logger(__name__)
+        self._memo_cache: "OrderedDict[str, Any]" = OrderedDict()
+        # Shared by all tasks, so its limit bounds concurrency across executions
+        self._worker_pool = WorkerPool(max_workers=settings.WORKFLOW_MAX_WORKERS)
     
     async def execute_flow(self, execution_id: str) -> None:
         """Execute a flow workflow."""
         async with AsyncSessionLocal() as db:
             try:
                 # Get execution and flow data
-                execution = await self._get_execution(db, execution_id)
+                execution, flow_version = await self._get_execution_with_flow_version(db, execution_id)
                 if not execution:
                     raise ValueError(f"Execution {execution_id} not found")
                 
-                flow_version = await self._get_flow_version(db, execution.flow_id)
                 if not flow_version or not flow_version.definition:
                     raise ValueError(f"Flow definition not found for execution {execution_id}")
                 
-                # Update execution status
+                # Update execution status; committed now so clients see it while the flow runs
                 await self._update_execution_status(db, execution_id, ExecutionStatus.RUNNING)
+                await db.commit()
                 
-                # Parse flow definition
-                flow_def = flow_version.definition
-                nodes = [FlowNode(**node) for node in flow_def.get('nodes', [])]
-                edges = [FlowEdge(**edge) for edge in flow_def.get('edges', [])]
-                
-                # Analyze DAG
-                dag = DAGAnalyzer(nodes, edges)
-                if not dag.validate_dag():
-                    raise ValueError("Flow contains cycles - not a valid DAG")
+                # Parse flow definition and analyze DAG (cached per version)
+                nodes, edges, dag = get_flow_graph(flow_version)
                 
                 # Create tasks
                 tasks = self._create_tasks(nodes, edges, execution.inputs or {})
                 
                 # Execute workflow
-                result = await self._execute_workflow(tasks, dag)
+                result = await self._execute_workflow(
+                    tasks, dag, self._get_max_concurrency(flow_version.definition)
+                )
                 
                 # Update execution with results
                 await self._complete_execution(db, execution_id, result)
+                await db.commit()
                 
             except Exception as e:
                 self.logger.error("Workflow execution failed", execution_id=execution_id, error=str(e))
+                # Discard whatever the failed step left in the transaction before recording the failure
+                await db.rollback()
                 await self._fail_execution(db, execution_id, str(e))
+                await db.commit()
                 raise
     
     def _create_tasks(self, nodes: List[FlowNode], edges: List[FlowEdge], flow_inputs: Dict[str, Any]) -> Dict[str, Task]:
         """Create executable tasks from flow nodes."""
-        tasks = {}
-        
-        # Build dependency and handle mapping
-        dependencies = {node.id: [] for node in nodes}
-        input_mappings = {node.id: {} for node in nodes}
+        # Build dependency and handle mapping in one pass over the edges
+        dependencies: Dict[str, List[str]] = defaultdict(list)
+        input_mappings: Dict[str, Dict[str, tuple[str, str]]] = defaultdict(dict)
         
         for edge in edges:
             dependencies[edge.target].append(edge.source)
@@ -198,8 +331,8 @@ class WorkflowOrchestrator:
             source_handle = edge.source_handle or 'default'
             input_mappings[edge.target][target_handle] = (edge.source, source_handle)
         
-        for node in nodes:
-            task = Task(
+        return {
+            node.id: Task(
                 id=f"task_{node.id}",
                 node_id=node.id,
                 node_type=node.type,
@@ -208,46 +341,108 @@ class WorkflowOrchestrator:
                 dependencies=dependencies[node.id],
                 input_mappings=input_mappings[node.id]
             )
-            tasks[node.id] = task
-        
-        return tasks
+            for node in nodes
+        }
+    
+    @staticmethod
+    def _get_max_concurrency(flow_def: Dict[str, Any]) -> int:
+        """Tasks one execution may run at once: the global limit, lowered by the flow's settings."""
+        limit = settings.WORKFLOW_MAX_WORKERS
+        flow_limit = (flow_def.get("settings") or {}).get("max_concurrency")
+        if isinstance(flow_limit, int) and flow_limit > 0:
+            limit = min(limit, flow_limit)
+        return limit
     
-    async def _execute_workflow(self, tasks: Dict[str, Task], dag: DAGAnalyzer) -> Dict[str, Any]:
-        """Execute the workflow tasks in proper order."""
-        completed_nodes = set()
+    async def _execute_workflow(
+        self,
+        tasks: Dict[str, Task],
+        dag: DAGAnalyzer,
+        max_concurrency: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute each task as soon as all of its dependencies have completed.
+        
+        Completions are reported through a queue and only the finished node's
+        dependents are checked, so scheduling costs O(V+E) over the whole run.
+        Ready tasks start in order of most descendants first
+        (see DAGAnalyzer.get_descendant_counts), at most max_concurrency at a
+        time; the rest wait in the ready heap so a wide flow can't flood
+        downstream services.
+        The first failure is raised at once; tasks still running are
+        cancelled and marked skipped.
+        """
         results = {}
+        pending = {node_id: dag.indegree[node_id] for node_id in tasks}
+        finished: asyncio.Queue = asyncio.Queue()
+        in_flight = 0
+        # Holds references so running tasks aren't garbage collected
+        running: Set[asyncio.Task] = set()
         
-        while len(completed_nodes) < len(tasks):
-            # Get executable nodes
-            executable_nodes = dag.get_executable_nodes(completed_nodes)
-            
-            if not executable_nodes:
-                remaining = set(tasks.keys()) - completed_nodes
-                raise ValueError(f"No executable nodes found. Remaining: {remaining}")
-            
-            # Execute nodes in parallel
-            execution_tasks = []
-            for node_id in executable_nodes:
-                task = tasks[node_id]
-                execution_tasks.append(self._execute_task(task, results))
-            
-            # Wait for all tasks to complete
-            task_results = await asyncio.gather(*execution_tasks, return_exceptions=True)
+        async def run_and_signal(node_id: str) -> None:
+            try:
+                result = await self._execute_task(tasks[node_id], results)
+            except asyncio.CancelledError:
+                tasks[node_id].status = TaskStatus.SKIPPED
+                raise
+            except Exception as e:
+                finished.put_nowait((node_id, None, e))
+            else:
+                finished.put_nowait((node_id, result, None))
+        
+        def dispatch(node_id: str) -> None:
+            nonlocal in_flight
+            in_flight += 1
+            runner = asyncio.create_task(run_and_signal(node_id))
+            running.add(runner)
+            runner.add_done_callback(running.discard)
+        
+        limit = max_concurrency or settings.WORKFLOW_MAX_WORKERS
+        
+        def dispatch_ready() -> None:
+            while ready and in_flight < limit:
+                dispatch(heapq.heappop(ready)[2])
+        
+        # Entries are (-descendant count, creation order, node_id)
+        priority = dag.get_descendant_counts()
+        order = {node_id: i for i, node_id in enumerate(tasks)}
+        ready = [(-priority[node_id], order[node_id], node_id) for node_id, count in pending.items() if count == 0]
+        heapq.heapify(ready)
+        
+        try:
+            dispatch_ready()
             
-            # Process results
-            for i, node_id in enumerate(executable_nodes):
+            while in_flight:
+                node_id, result, error = await finished.get()
+                in_flight -= 1
                 task = tasks[node_id]
-                result = task_results[i]
                 
-                if isinstance(result, Exception):
+                if error is not None:
                     task.status = TaskStatus.FAILED
-                    task.error = str(result)
-                    raise result
-                else:
-                    task.status = TaskStatus.COMPLETED
-                    task.result = result
-                    results[node_id] = result
-                    completed_nodes.add(node_id)
+                    task.error = str(error)
+                    raise error
+                
+                task.status = TaskStatus.COMPLETED
+                task.result = result
+                results[node_id] = result
+                
+                for dependent_id in dag.adjacency_list[node_id]:
+                    pending[dependent_id] -= 1
+                    if pending[dependent_id] == 0:
+                        heapq.heappush(ready, (-priority[dependent_id], order[dependent_id], dependent_id))
+                # A slot was freed even if nothing new became ready
+                dispatch_ready()
+        finally:
+            # Stop the tasks still running after a failure, or if this run is cancelled.
+            # On success every runner is already done, so there is nothing to await
+            unfinished = [runner for runner in running if not runner.done()]
+            for runner in unfinished:
+                runner.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
+        
+        if len(results) < len(tasks):
+            remaining = set(tasks.keys()) - results.keys()
+            raise ValueError(f"No executable nodes found. Remaining: {remaining}")
         
         return results
     
@@ -259,11 +454,6 @@ class WorkflowOrchestrator:
         self.logger.info("Executing task", task_id=task.id, node_type=task.node_type)
         
         try:
-            # Import worker system
-            from src.workers import node_registry, WorkerPool
-            from src.workers.base_worker import ExecutionContext
-            from src.workers.type_converter import TypeConverter
-            
             # Prepare task inputs from dependencies using handle mappings
             task_inputs = task.inputs.copy() if task.inputs else {}
             
@@ -295,15 +485,25 @@ class WorkflowOrchestrator:
                 node_id=task.node_id
             )
             
+            # Reuse the result of an identical earlier run for nodes that opt in
+            memo_key = self._get_memo_key(task, task_inputs) if task.config.get("memoize") else None
+            if memo_key and memo_key in self._memo_cache:
+                self._memo_cache.move_to_end(memo_key)
+                task.completed_at = datetime.utcnow()
+                self.logger.debug("Task result reused from memo cache", task_id=task.id)
+                return self._memo_cache[memo_key]
+            
             # Execute using worker pool
-            worker_pool = WorkerPool(max_workers=5)
-            result = await worker_pool.execute_task(
+            result = await self._worker_pool.execute_task(
                 executor=executor,
                 config=task.config,
                 inputs=task_inputs,
                 context=exec_context
             )
             
+            if memo_key:
+                self._store_memo_result(memo_key, result)
+            
             task.completed_at = datetime.utcnow()
             return result
             
@@ -313,16 +513,37 @@ class WorkflowOrchestrator:
             self.logger.error("Task execution failed", task_id=task.id, error=str(e))
             raise
     
+    def _get_memo_key(self, task: Task, task_inputs: Dict[str, Any]) -> Optional[str]:
+        """
+        Hash node type, config and resolved inputs into a memo key.
+        
+        Returns None when the values are not JSON serializable, in which case
+        the task is simply executed without memoization.
+        """
+        try:
+            payload = orjson.dumps(
+                (task.node_type, task.config, task_inputs),
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            return None
+        
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def _store_memo_result(self, memo_key: str, result: Any) -> None:
+        """Store a task result in the memo cache, evicting the least recently used."""
+        self._memo_cache[memo_key] = result
+        self._memo_cache.move_to_end(memo_key)
+        while len(self._memo_cache) > MEMO_CACHE_SIZE:
+            self._memo_cache.popitem(last=False)
     
     async def _get_execution(self, db: AsyncSession, execution_id: str) -> Optional[Execution]:
         """Get execution from database."""
-        from sqlalchemy import select
         result = await db.execute(select(Execution).where(Execution.id == execution_id))
         return result.scalar_one_or_none()
     
     async def _get_flow_version(self, db: AsyncSession, flow_id: str) -> Optional[FlowVersion]:
         """Get latest flow version."""
-        from sqlalchemy import select
         result = await db.execute(
             select(FlowVersion)
             .where(FlowVersion.flow_id == flow_id)
@@ -331,41 +552,55 @@ class WorkflowOrchestrator:
         )
         return result.scalar_one_or_none()
     
-    async def _update_execution_status(self, db: AsyncSession, execution_id: str, status: ExecutionStatus):
-        """Update execution status."""
+    async def _get_execution_with_flow_version(
+        self, db: AsyncSession, execution_id: str
+    ) -> Tuple[Optional[Execution], Optional[FlowVersion]]:
+        """Get an execution and its flow's latest version in one round trip."""
         result = await db.execute(
-            select(Execution).where(Execution.id == execution_id)
+            select(Execution, FlowVersion)
+            .outerjoin(FlowVersion, FlowVersion.flow_id == Execution.flow_id)
+            .where(Execution.id == execution_id)
+            .order_by(FlowVersion.version_number.desc())
+            .limit(1)
         )
-        execution = result.scalar_one_or_none()
-        if execution:
-            execution.status = status
-            if status == ExecutionStatus.RUNNING and not execution.started_at:
-                execution.started_at = datetime.utcnow()
-            await db.commit()
+        row = result.first()
+        return (row[0], row[1]) if row else (None, None)
+    
+    async def _update_execution(self, db: AsyncSession, execution_id: str, **values: Any):
+        """
+        Apply a status transition as a single UPDATE, without loading the row first.
+        
+        The caller commits, so a transition can share a transaction with other writes.
+        """
+        await db.execute(
+            update(Execution).where(Execution.id == execution_id).values(**values)
+        )
+    
+    async def _update_execution_status(self, db: AsyncSession, execution_id: str, status: ExecutionStatus):
+        """Update execution status."""
+        values: Dict[str, Any] = {"status": status}
+        if status == ExecutionStatus.RUNNING:
+            # Keep the original start time if the execution was started before
+            values["started_at"] = func.coalesce(Execution.started_at, datetime.utcnow())
+        await self._update_execution(db, execution_id, **values)
     
     async def _complete_execution(self, db: AsyncSession, execution_id: str, results: Dict[str, Any]):
         """Complete execution with results."""
-        result = await db.execute(
-            select(Execution).where(Execution.id == execution_id)
+        await self._update_execution(
+            db, execution_id,
+            status=ExecutionStatus.COMPLETED,
+            completed_at=datetime.utcnow(),
+            outputs=results
         )
-        execution = result.scalar_one_or_none()
-        if execution:
-            execution.status = ExecutionStatus.COMPLETED
-            execution.completed_at = datetime.utcnow()
-            execution.outputs = results
-            await db.commit()
     
     async def _fail_execution(self, db: AsyncSession, execution_id: str, error_message: str):
         """Fail execution with error."""
-        result = await db.execute(
-            select(Execution).where(Execution.id == execution_id)
+        await self._update_execution(
+            db, execution_id,
+            status=ExecutionStatus.FAILED,
+            completed_at=datetime.utcnow(),
+            error_message=error_message
         )
-        execution = result.scalar_one_or_none()
-        if execution:
-            execution.status = ExecutionStatus.FAILED
-            execution.completed_at = datetime.utcnow()
-            execution.error_message = error_message
-            await db.commit()
 
 
 # Global orchestrator instance
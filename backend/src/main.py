@@ -13,10 +13,11 @@ from sqlalchemy import text
 
 from src.config.settings import get_settings
 from src.core.database import engine
-from src.middleware.auth import auth_middleware
+from src.middleware.auth import auth_middleware, create_auth_client
 from src.middleware.logging import LoggingMiddleware
 from src.workers import initialize_workers
 from src.core.message_queue import message_queue
+from src.core import queued_workflow_engine
 from src.core.queued_workflow_engine import initialize_queued_orchestrator
 from src.services.deployment_service import deployment_service
 from src.services.monitoring_service import monitoring_service
@@ -37,6 +38,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
             await conn.execute(text("SELECT 1"))
         logger.info("Database connection established")
         
+        # Pooled client for token validation, reused across requests
+        app.state.auth_http = create_auth_client()
+        
         # Initialize workers
         initialize_workers()
         logger.info("Workers initialized")
@@ -68,7 +72,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     # Shutdown
     logger.info("Shutting down MAX Flowstudio Backend")
     # await monitoring_service.stop_monitoring()  # Disabled
+    if queued_workflow_engine.queued_orchestrator:
+        await queued_workflow_engine.queued_orchestrator.close()
     await message_queue.disconnect()
+    await app.state.auth_http.aclose()
     await engine.dispose()
 
 
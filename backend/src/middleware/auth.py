@@ -3,10 +3,15 @@ Authentication middleware for JWT token validation
 Flow: Request -> Extract Token -> Validate with Auth Server -> Set User Context
 """
 
-from typing import Optional
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
 
 import httpx
 from fastapi import Request, Response
+from jose import JWTError, jwt
 from starlette.middleware.base import RequestResponseEndpoint
 
 from src.config.settings import get_settings
@@ -15,13 +20,76 @@ from src.core.logging import get_logger
 logger = get_logger(__name__)
 settings = get_settings()
 
-# Paths that don't require authentication
-PUBLIC_PATHS = {
+# Paths that don't require authentication, including anything below them
+PUBLIC_PATHS = (
     "/api/health",
     "/api/docs",
     "/api/redoc",
     "/openapi.json",
-}
+)
+
+
+def compile_path_prefixes(paths: Tuple[str, ...]) -> "re.Pattern[str]":
+    """
+    Compile path prefixes into one alternation matched in C, anchored at a path
+    segment boundary so that e.g. "/api/healthcheck-admin" doesn't match "/api/health".
+    """
+    return re.compile("(?:" + "|".join(re.escape(path) for path in paths) + ")(?:/|$)")
+
+
+_PUBLIC_PATH_RE = compile_path_prefixes(PUBLIC_PATHS)
+
+# Origins that get CORS headers on error responses
+CORS_ORIGINS = frozenset(settings.CORS_ORIGINS)
+
+USERINFO_URL = f"{settings.AUTH_SERVER_URL}/api/oauth/userinfo"
+
+# Validated tokens are trusted for this many seconds without asking the auth server,
+# and never past their own exp claim
+USERINFO_CACHE_TTL = 60.0
+USERINFO_CACHE_SIZE = 10000
+
+# sha256(token) -> (expires at, user data), least recently used first
+_userinfo_cache: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+
+
+def _with_access_claims(user_data: dict) -> dict:
+    """
+    Add the group_id and is_superuser claims RBAC checks read, derived once per
+    validated token the same way core.auth creates local users: the first
+    userinfo group, and is_admin taking precedence over is_superuser.
+    
+    Admin checks that read request.state.user (e.g. the system endpoints) see
+    the same is_superuser value.
+    """
+    groups = user_data.get("groups") or []
+    user_data.setdefault("group_id", groups[0].get("id") if groups else None)
+    user_data["is_superuser"] = user_data.get("is_admin", user_data.get("is_superuser", False))
+    return user_data
+
+
+def _cache_lifetime(token: str) -> float:
+    """
+    Seconds a validated token may be served from the cache: USERINFO_CACHE_TTL,
+    cut short by the token's exp claim. The claim is read without verifying the
+    signature; the auth server has just accepted the token. Opaque tokens
+    without readable claims get the full TTL.
+    """
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        return USERINFO_CACHE_TTL
+    if not isinstance(exp, (int, float)):
+        return USERINFO_CACHE_TTL
+    return min(USERINFO_CACHE_TTL, exp - time.time())
+
+
+def create_auth_client() -> httpx.AsyncClient:
+    """Create the pooled client used to validate tokens; owned by the app lifespan."""
+    return httpx.AsyncClient(
+        timeout=5.0,
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+    )
 
 
 async def auth_middleware(request: Request, call_next: RequestResponseEndpoint) -> Response:
@@ -32,7 +100,7 @@ async def auth_middleware(request: Request, call_next: RequestResponseEndpoint)
         return await call_next(request)
     
     # Skip auth for public paths
-    if any(request.url.path.startswith(path) for path in PUBLIC_PATHS):
+    if _PUBLIC_PATH_RE.match(request.url.path):
         return await call_next(request)
     
     # Extract token from Authorization header
@@ -42,43 +110,57 @@ async def auth_middleware(request: Request, call_next: RequestResponseEndpoint)
         response = Response(content="Unauthorized", status_code=401)
         # Add CORS headers for error responses
         origin = request.headers.get("Origin")
-        if origin and origin in settings.CORS_ORIGINS:
+        if origin and origin in CORS_ORIGINS:
             response.headers["Access-Control-Allow-Origin"] = origin
             response.headers["Access-Control-Allow-Credentials"] = "true"
         return response
     
     token = auth_header.split(" ")[1]
     
+    # Reuse a recent successful validation of the same token
+    cache_key = hashlib.sha256(token.encode()).digest()
+    cached = _userinfo_cache.get(cache_key)
+    if cached is not None:
+        if cached[0] > time.monotonic():
+            _userinfo_cache.move_to_end(cache_key)
+            # Each request gets its own copy so handler mutations don't leak
+            request.state.user = dict(cached[1])
+            return await call_next(request)
+        del _userinfo_cache[cache_key]
+    
     # Validate token with OAuth 2.0 userinfo endpoint
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.AUTH_SERVER_URL}/api/oauth/userinfo",
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=5.0,
-            )
+        response = await request.app.state.auth_http.get(
+            USERINFO_URL,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        
+        if response.status_code == 200:
+            user_data = _with_access_claims(response.json())
+            # Store user data in request state
+            request.state.user = user_data
+            lifetime = _cache_lifetime(token)
+            if lifetime > 0:
+                _userinfo_cache[cache_key] = (time.monotonic() + lifetime, dict(user_data))
+                if len(_userinfo_cache) > USERINFO_CACHE_SIZE:
+                    _userinfo_cache.popitem(last=False)
+            logger.info("User authenticated", user_id=user_data.get("id"))
+        else:
+            logger.warning("Token validation failed", status=response.status_code)
+            response = Response(content="Unauthorized", status_code=401)
+            # Add CORS headers for error responses
+            origin = request.headers.get("Origin")
+            if origin and origin in CORS_ORIGINS:
+                response.headers["Access-Control-Allow-Origin"] = origin
+                response.headers["Access-Control-Allow-Credentials"] = "true"
+            return response
             
-            if response.status_code == 200:
-                user_data = response.json()
-                # Store user data in request state
-                request.state.user = user_data
-                logger.info("User authenticated", user_id=user_data.get("id"))
-            else:
-                logger.warning("Token validation failed", status=response.status_code)
-                response = Response(content="Unauthorized", status_code=401)
-                # Add CORS headers for error responses
-                origin = request.headers.get("Origin")
-                if origin and origin in settings.CORS_ORIGINS:
-                    response.headers["Access-Control-Allow-Origin"] = origin
-                    response.headers["Access-Control-Allow-Credentials"] = "true"
-                return response
-                
     except Exception as e:
         logger.error("Auth server error", error=str(e))
         response = Response(content="Authentication service unavailable", status_code=503)
         # Add CORS headers for error responses
         origin = request.headers.get("Origin")
-        if origin and origin in settings.CORS_ORIGINS:
+        if origin and origin in CORS_ORIGINS:
             response.headers["Access-Control-Allow-Origin"] = origin
             response.headers["Access-Control-Allow-Credentials"] = "true"
         return response
@@ -89,5 +171,11 @@ async def auth_middleware(request: Request, call_next: RequestResponseEndpoint)
 
 
 def get_current_user(request: Request) -> Optional[dict]:
-    """Get current user from request state."""
+    """
+    Get current user claims from request state.
+    
+    Besides the userinfo fields these include group_id and is_superuser. They
+    reflect the auth server at validation time and can lag a permission change by
+    up to USERINFO_CACHE_TTL seconds (or the token lifetime, whichever is shorter).
+    """
     return getattr(request.state, "user", None)
\ No newline at end of file
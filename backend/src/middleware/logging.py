@@ -2,6 +2,7 @@
 Logging middleware for request/response tracking
 """
 
+import re
 import time
 import uuid
 from typing import Callable
@@ -10,9 +11,25 @@ from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from src.core.logging import get_logger
+from src.middleware.auth import compile_path_prefixes
 
 logger = get_logger(__name__)
 
+# Polled or static paths whose requests aren't worth a log entry
+SKIP_LOG_PATHS = (
+    "/api/health",
+    "/api/docs",
+    "/api/redoc",
+    "/openapi.json",
+    "/metrics",
+)
+
+_SKIP_LOG_PATH_RE = compile_path_prefixes(SKIP_LOG_PATHS)
+
+# Client-supplied request IDs end up in logs and response headers, so only
+# short IDs without control or separator characters are accepted
+_REQUEST_ID_RE = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
 
 class LoggingMiddleware(BaseHTTPMiddleware):
     """Middleware to log all HTTP requests and responses."""
@@ -20,11 +37,18 @@ class LoggingMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process and log the request/response."""
         
-        # Generate request ID
-        request_id = str(uuid.uuid4())
+        # Reuse a well-formed request ID set upstream (e.g. by a proxy), else generate one
+        request_id = request.headers.get("x-request-id")
+        if not request_id or not _REQUEST_ID_RE.fullmatch(request_id):
+            request_id = uuid.uuid4().hex
+        
+        if _SKIP_LOG_PATH_RE.match(request.url.path):
+            response = await call_next(request)
+            response.headers["X-Request-ID"] = request_id
+            return response
         
         # Start timer
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Log request
         logger.info(
@@ -39,7 +63,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         response = await call_next(request)
         
         # Calculate duration
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         
         # Log response
         logger.info(
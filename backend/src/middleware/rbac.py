@@ -3,18 +3,19 @@ Role-Based Access Control (RBAC) Middleware
 Flow: Request -> Auth -> Permission Check -> Resource Access
 """
 
-from typing import Optional, List
+from typing import Awaitable, Callable, Optional
 from functools import wraps
 
-from fastapi import HTTPException, status, Request
+from fastapi import Depends, HTTPException, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
-from src.models.user import User
 from src.models.workspace import Workspace
-from src.models.workspace_permission import WorkspacePermission, PermissionType
+from src.models.workspace_permission import (
+    ACCESS_MASK, DELETE_MASK, MANAGE_FLOWS_MASK, MODIFY_MASK
+)
 from src.middleware.auth import get_current_user
-from src.core.database import AsyncSessionLocal
+from src.core.database import get_db
+from src.services.permission_cache import get_permission_mask
 
 
 class RBACError(Exception):
@@ -29,40 +30,17 @@ class PermissionChecker:
     async def has_workspace_permission(
         user_id: str,
         workspace_id: str,
-        required_permissions: List[PermissionType],
+        required_mask: int,
         group_id: Optional[str] = None,
         is_admin: bool = False
     ) -> bool:
-        """Check if user has required permission for workspace."""
+        """Check if user holds any of the PermissionBits in required_mask for workspace."""
         
         if is_admin:
             return True
         
-        async with AsyncSessionLocal() as db:
-            # Check direct user permission
-            user_perm_query = select(WorkspacePermission).where(
-                WorkspacePermission.workspace_id == workspace_id,
-                WorkspacePermission.user_id == user_id
-            )
-            result = await db.execute(user_perm_query)
-            user_permission = result.scalar_one_or_none()
-            
-            if user_permission and user_permission.permission_type in required_permissions:
-                return True
-            
-            # Check group permission if available
-            if group_id:
-                group_perm_query = select(WorkspacePermission).where(
-                    WorkspacePermission.workspace_id == workspace_id,
-                    WorkspacePermission.group_id == group_id
-                )
-                result = await db.execute(group_perm_query)
-                group_permission = result.scalar_one_or_none()
-                
-                if group_permission and group_permission.permission_type in required_permissions:
-                    return True
-        
-        return False
+        user_mask = await get_permission_mask(user_id, workspace_id, group_id)
+        return bool(user_mask & required_mask)
     
     @staticmethod
     async def can_access_workspace(
@@ -76,12 +54,7 @@ class PermissionChecker:
         return await PermissionChecker.has_workspace_permission(
             user_id=user_id,
             workspace_id=workspace_id,
-            required_permissions=[
-                PermissionType.OWNER,
-                PermissionType.ADMIN,
-                PermissionType.MEMBER,
-                PermissionType.VIEWER
-            ],
+            required_mask=ACCESS_MASK,
             group_id=group_id,
             is_admin=is_admin
         )
@@ -98,10 +71,7 @@ class PermissionChecker:
         return await PermissionChecker.has_workspace_permission(
             user_id=user_id,
             workspace_id=workspace_id,
-            required_permissions=[
-                PermissionType.OWNER,
-                PermissionType.ADMIN
-            ],
+            required_mask=MODIFY_MASK,
             group_id=group_id,
             is_admin=is_admin
         )
@@ -118,7 +88,7 @@ class PermissionChecker:
         return await PermissionChecker.has_workspace_permission(
             user_id=user_id,
             workspace_id=workspace_id,
-            required_permissions=[PermissionType.OWNER],
+            required_mask=DELETE_MASK,
             group_id=group_id,
             is_admin=is_admin
         )
@@ -135,102 +105,68 @@ class PermissionChecker:
         return await PermissionChecker.has_workspace_permission(
             user_id=user_id,
             workspace_id=workspace_id,
-            required_permissions=[
-                PermissionType.OWNER,
-                PermissionType.ADMIN,
-                PermissionType.MEMBER
-            ],
+            required_mask=MANAGE_FLOWS_MASK,
             group_id=group_id,
             is_admin=is_admin
         )
 
 
-def require_permission(required_permissions: List[PermissionType]):
-    """Decorator to require specific permissions for workspace access."""
+def require_permission(required_mask: int) -> Callable[..., Awaitable[dict]]:
+    """
+    Dependency factory requiring any of the PermissionBits in required_mask.
     
-    def decorator(func):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            # Extract request and workspace_id from function arguments
-            request = None
-            workspace_id = None
-            
-            for arg in args:
-                if isinstance(arg, Request):
-                    request = arg
-                    break
-            
-            workspace_id = kwargs.get('workspace_id')
-            
-            if not request or not workspace_id:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Missing request or workspace_id for permission check"
-                )
-            
-            # Get current user
-            current_user = get_current_user(request)
-            if not current_user:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Authentication required"
-                )
-            
-            # Get user from database to get group_id
-            async with AsyncSessionLocal() as db:
-                user_result = await db.execute(
-                    select(User).where(User.id == current_user["id"])
-                )
-                user = user_result.scalar_one_or_none()
-                
-                if not user:
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="User not found"
-                    )
-            
-            # Check permissions
-            has_permission = await PermissionChecker.has_workspace_permission(
-                user_id=user.id,
-                workspace_id=workspace_id,
-                required_permissions=required_permissions,
-                group_id=user.group_id,
-                is_admin=user.is_superuser
+    The dependency reads workspace_id from the path and takes group_id and
+    is_superuser from the auth claims, so no User lookup is needed; permissions
+    come from the short-lived permission cache, falling back to the request's
+    session. Returns the current user claims.
+    """
+    
+    async def dependency(
+        workspace_id: str,
+        request: Request,
+        db: AsyncSession = Depends(get_db)
+    ) -> dict:
+        current_user = get_current_user(request)
+        if not current_user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Authentication required"
             )
-            
-            if not has_permission:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Insufficient permissions for this operation"
-                )
-            
-            return await func(*args, **kwargs)
         
-        return wrapper
-    return decorator
+        if current_user.get("is_superuser", False):
+            return current_user
+        
+        user_mask = await get_permission_mask(
+            current_user["id"],
+            workspace_id,
+            current_user.get("group_id"),
+            db=db
+        )
+        
+        if not user_mask & required_mask:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions for this operation"
+            )
+        
+        return current_user
+    
+    return dependency
 
 
 def require_workspace_access():
-    """Decorator to require any level of workspace access."""
-    return require_permission([
-        PermissionType.OWNER,
-        PermissionType.ADMIN,
-        PermissionType.MEMBER,
-        PermissionType.VIEWER
-    ])
+    """Dependency requiring any level of workspace access."""
+    return require_permission(ACCESS_MASK)
 
 
 def require_workspace_modify():
-    """Decorator to require workspace modification permissions."""
-    return require_permission([
-        PermissionType.OWNER,
-        PermissionType.ADMIN
-    ])
+    """Dependency requiring workspace modification permissions."""
+    return require_permission(MODIFY_MASK)
 
 
 def require_workspace_owner():
-    """Decorator to require workspace owner permissions."""
-    return require_permission([PermissionType.OWNER])
+    """Dependency requiring workspace owner permissions."""
+    return require_permission(DELETE_MASK)
 
 
 def require_admin():
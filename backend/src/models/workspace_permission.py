@@ -5,7 +5,7 @@ Flow: User/Group -> Workspace -> Permission level
 
 from datetime import datetime
 from typing import TYPE_CHECKING
-from enum import Enum
+from enum import Enum, IntFlag
 
 from sqlalchemy import String, DateTime, ForeignKey, func, Enum as SQLEnum, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -25,6 +25,28 @@ class PermissionType(str, Enum):
     VIEWER = "viewer"   # Read-only access
 
 
+class PermissionBits(IntFlag):
+    """Permission types as bits, so a set of them is one int and a check is one AND."""
+    VIEWER = 1
+    MEMBER = 2
+    ADMIN = 4
+    OWNER = 8
+
+
+PERMISSION_BITS = {
+    PermissionType.OWNER: PermissionBits.OWNER,
+    PermissionType.ADMIN: PermissionBits.ADMIN,
+    PermissionType.MEMBER: PermissionBits.MEMBER,
+    PermissionType.VIEWER: PermissionBits.VIEWER,
+}
+
+# Permission types accepted by each kind of workspace operation
+ACCESS_MASK = PermissionBits.OWNER | PermissionBits.ADMIN | PermissionBits.MEMBER | PermissionBits.VIEWER
+MANAGE_FLOWS_MASK = PermissionBits.OWNER | PermissionBits.ADMIN | PermissionBits.MEMBER
+MODIFY_MASK = PermissionBits.OWNER | PermissionBits.ADMIN
+DELETE_MASK = PermissionBits.OWNER
+
+
 class WorkspacePermission(Base):
     """WorkspacePermission model - manages user/group permissions for workspaces."""
     
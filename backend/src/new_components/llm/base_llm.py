@@ -21,6 +21,9 @@ logger = structlog.get_logger()
 class BaseLLMComponent(BaseComponent):
     """Base class for all LLM components with common functionality."""
     
+    # LLM responses are sampled, never reuse them
+    deterministic = False
+    
     def __init__(self, component_id: str):
         super().__init__(component_id)
         self.api_key: Optional[str] = None
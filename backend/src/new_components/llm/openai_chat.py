@@ -42,6 +42,9 @@ class OpenAIChatComponent(BaseComponent):
     - Error reporting and status updates
     """
     
+    # LLM responses are sampled, never reuse them
+    deterministic = False
+    
     def __init__(self, **kwargs):
         """Initialize OpenAI Chat component."""
         super().__init__(**kwargs)
@@ -20,6 +20,9 @@ class TemplateFormatterComponent(BaseComponent):
     - 기본값 처리 및 에러 처리 옵션
     """
     
+    # Output depends only on the template and variables, so results may be reused
+    deterministic = True
+    
     def __init__(self):
         super().__init__(
             name="Template Formatter",
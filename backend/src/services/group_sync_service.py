@@ -16,6 +16,7 @@ from sqlalchemy.dialects.postgresql import insert
 
 from src.core.database import get_db
 from src.models.group import Group
+from src.services.permission_cache import invalidate_group
 
 logger = structlog.get_logger(__name__)
 
@@ -171,6 +172,7 @@ class GroupSyncService:
                                    group_id=auth_group.get("id"), error=str(e))
                 
                 # Optionally remove local-only groups (groups not in Auth Server)
+                removed_group_ids: List[str] = []
                 if not preserve_local_groups:
                     local_only_query = select(Group).where(~Group.id.in_(auth_group_ids))
                     result = await db.execute(local_only_query)
@@ -179,10 +181,13 @@ class GroupSyncService:
                     for group in local_only_groups:
                         if not group.is_system_group:  # Preserve system groups
                             await db.delete(group)
+                            removed_group_ids.append(str(group.id))
                             logger.info("Removed local-only group", group_id=str(group.id), name=group.name)
                 
                 # Commit all changes
                 await db.commit()
+                for group_id in removed_group_ids:
+                    invalidate_group(group_id)
                 
                 # Count final local groups
                 result = await db.execute(local_count_query)
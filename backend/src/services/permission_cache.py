@@ -0,0 +1,104 @@
+"""
+Permission Cache - Short-lived cache of workspace permissions
+Flow: (user, workspace, group) -> Cached permission set -> Database lookup on miss
+"""
+
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import structlog
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.settings import get_settings
+from src.core.database import AsyncSessionLocal
+from src.models.workspace_permission import WorkspacePermission, PERMISSION_BITS
+
+logger = structlog.get_logger(__name__)
+settings = get_settings()
+
+# Entries kept per process; the least recently used are evicted first
+PERMISSION_CACHE_SIZE = 10000
+
+PermissionKey = Tuple[str, str, Optional[str]]
+
+# (user_id, workspace_id, group_id) -> (expires at, PermissionBits mask)
+_permission_cache: "OrderedDict[PermissionKey, Tuple[float, int]]" = OrderedDict()
+
+
+async def get_permission_mask(
+    user_id: str,
+    workspace_id: str,
+    group_id: Optional[str] = None,
+    db: Optional[AsyncSession] = None
+) -> int:
+    """
+    Get the PermissionBits a user holds on a workspace, directly or through a group.
+    
+    Results are cached for RBAC_CACHE_TTL seconds, so permission changes made
+    elsewhere take effect within that window; changes made through this process
+    should call invalidate_workspace(). Pass db to run a cache miss on the
+    caller's session instead of opening a new one.
+    """
+    key = (user_id, workspace_id, group_id)
+    cached = _permission_cache.get(key)
+    if cached is not None:
+        if cached[0] > time.monotonic():
+            _permission_cache.move_to_end(key)
+            return cached[1]
+        del _permission_cache[key]
+    
+    # Direct user permission and, if available, group permission in one query
+    holder = WorkspacePermission.user_id == user_id
+    if group_id:
+        holder = or_(holder, WorkspacePermission.group_id == group_id)
+    
+    query = select(WorkspacePermission.permission_type).where(
+        WorkspacePermission.workspace_id == workspace_id,
+        holder
+    )
+    if db is not None:
+        permission_types = (await db.execute(query)).scalars().all()
+    else:
+        async with AsyncSessionLocal() as session:
+            permission_types = (await session.execute(query)).scalars().all()
+    
+    mask = 0
+    for permission_type in permission_types:
+        mask |= PERMISSION_BITS[permission_type]
+    
+    _permission_cache[key] = (time.monotonic() + settings.RBAC_CACHE_TTL, mask)
+    if len(_permission_cache) > PERMISSION_CACHE_SIZE:
+        _permission_cache.popitem(last=False)
+    
+    return mask
+
+
+def _invalidate(position: int, value: str) -> int:
+    """Drop cached entries whose key has value at position; returns how many."""
+    stale = [key for key in _permission_cache if key[position] == value]
+    for key in stale:
+        del _permission_cache[key]
+    return len(stale)
+
+
+def invalidate_workspace(workspace_id: str) -> None:
+    """Drop cached permissions for a workspace after its permissions change."""
+    entries = _invalidate(1, workspace_id)
+    if entries:
+        logger.debug("Workspace permissions invalidated", workspace_id=workspace_id, entries=entries)
+
+
+def invalidate_user(user_id: str) -> None:
+    """Drop cached permissions for a user after their access or group membership changes."""
+    entries = _invalidate(0, user_id)
+    if entries:
+        logger.debug("User permissions invalidated", user_id=user_id, entries=entries)
+
+
+def invalidate_group(group_id: str) -> None:
+    """Drop cached permissions resolved through a group after it changes or is deleted."""
+    entries = _invalidate(2, group_id)
+    if entries:
+        logger.debug("Group permissions invalidated", group_id=group_id, entries=entries)
@@ -10,6 +10,12 @@ from typing import Optional
 
 import structlog
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 from src.core.message_queue import MessageQueue, QueuedTaskExecutor
 from src.workers import initialize_workers
 from src.config.settings import get_settings
@@ -81,6 +87,12 @@ class WorkerService:
         signal.signal(signal.SIGTERM, signal_handler)
 
 
+def install_event_loop() -> None:
+    """Use uvloop for the worker's event loop when it is installed."""
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
+
+
 async def main():
     """Main entry point for worker service."""
     service = WorkerService()
@@ -96,4 +108,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    install_event_loop()
     asyncio.run(main())
\ No newline at end of file
@@ -17,6 +17,7 @@ from src.models.workspace_permission import WorkspacePermission, PermissionType
 from src.models.flow_workspace_map import FlowWorkspaceMap
 from src.models.user import User
 from src.models.flow import Flow
+from src.services.permission_cache import invalidate_workspace
 
 logger = structlog.get_logger(__name__)
 
@@ -72,6 +73,7 @@ class WorkspaceService:
             db.add(group_permission)
         
         await db.commit()
+        invalidate_workspace(workspace.id)
         
         # Refresh workspace with eagerly loaded relationships to prevent lazy loading issues
         workspace_query = select(Workspace).options(
@@ -256,6 +258,7 @@ class WorkspaceService:
         workspace.updated_at = datetime.utcnow()
         
         await db.commit()
+        invalidate_workspace(workspace_id)
         
         logger.info(
             "Workspace deleted",
@@ -0,0 +1,8 @@
+"""
+Shared test configuration.
+Settings are read at import time, so required values are set before any src import.
+"""
+
+import os
+
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
@@ -0,0 +1,101 @@
+"""
+Auth middleware tests: reuse of validated tokens from the userinfo cache.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from jose import jwt
+
+from src.middleware import auth
+
+
+@pytest.fixture
+def auth_app():
+    """App behind auth_middleware whose auth server accepts any token but "bad"."""
+    auth._userinfo_cache.clear()
+    calls = []
+    
+    def userinfo(request):
+        calls.append(request.headers["Authorization"])
+        if request.headers["Authorization"] == "Bearer bad":
+            return httpx.Response(401)
+        return httpx.Response(200, json={"id": "user-1", "groups": [{"id": "group-1"}]})
+    
+    app = FastAPI()
+    app.middleware("http")(auth.auth_middleware)
+    app.state.auth_http = httpx.AsyncClient(transport=httpx.MockTransport(userinfo))
+    
+    @app.get("/api/me")
+    async def me(request: Request):
+        user = request.state.user
+        response = dict(user)
+        # A handler mutating its user dict must not change later requests
+        user["tampered"] = True
+        return response
+    
+    yield app, calls
+    auth._userinfo_cache.clear()
+
+
+async def get_me(app, token):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get("/api/me", headers={"Authorization": f"Bearer {token}"})
+
+
+def test_cache_lifetime_is_capped_by_exp():
+    soon = jwt.encode({"exp": time.time() + 10}, "key")
+    expired = jwt.encode({"exp": time.time() - 5}, "key")
+    
+    assert 9 < auth._cache_lifetime(soon) <= 10
+    assert auth._cache_lifetime(expired) <= 0
+    assert auth._cache_lifetime(jwt.encode({"sub": "user-1"}, "key")) == auth.USERINFO_CACHE_TTL
+    assert auth._cache_lifetime("opaque-token") == auth.USERINFO_CACHE_TTL
+
+
+async def test_validated_token_is_reused(auth_app):
+    app, calls = auth_app
+    
+    first = await get_me(app, "good")
+    second = await get_me(app, "good")
+    
+    assert first.status_code == second.status_code == 200
+    assert len(calls) == 1
+    assert second.json()["group_id"] == "group-1"
+    assert "tampered" not in second.json()
+
+
+async def test_rejected_token_is_not_cached(auth_app):
+    app, calls = auth_app
+    
+    assert (await get_me(app, "bad")).status_code == 401
+    assert (await get_me(app, "bad")).status_code == 401
+    assert len(calls) == 2
+
+
+async def test_cache_entry_expires_with_ttl(auth_app, monkeypatch):
+    app, calls = auth_app
+    monkeypatch.setattr(auth, "USERINFO_CACHE_TTL", 0.05)
+    
+    await get_me(app, "good")
+    await asyncio.sleep(0.1)
+    await get_me(app, "good")
+    
+    assert len(calls) == 2
+
+
+async def test_cache_entry_expires_with_token(auth_app):
+    app, calls = auth_app
+    token = jwt.encode({"exp": time.time() + 0.1}, "key")
+    
+    await get_me(app, token)
+    await get_me(app, token)
+    assert len(calls) == 1
+    
+    await asyncio.sleep(0.15)
+    await get_me(app, token)
+    assert len(calls) == 2
@@ -0,0 +1,144 @@
+"""
+Message queue tests: batched acknowledgements and the retry bound.
+"""
+
+import asyncio
+from datetime import datetime
+
+import orjson
+import pytest
+
+from src.core.message_queue import AckBatcher, MessageQueue, RETRY_DELAYS
+
+
+class FakeMessage:
+    """Records ack/reject calls in a shared log."""
+    
+    def __init__(self, delivery_tag, log, headers=None, body=b"{}"):
+        self.delivery_tag = delivery_tag
+        self.log = log
+        self.headers = headers
+        self.body = body
+        self.content_type = "application/json"
+        self.message_id = f"msg-{delivery_tag}"
+        self.timestamp = datetime(2024, 1, 1)
+    
+    async def ack(self, multiple=False):
+        self.log.append(("ack", self.delivery_tag, multiple))
+    
+    async def reject(self, requeue=True):
+        self.log.append(("reject", self.delivery_tag, requeue))
+
+
+def replay(log, delivered, completed):
+    """
+    Apply the logged acks/rejects the way the broker would.
+    
+    Fails if a delivery is settled twice or acked before it completed;
+    returns the tags acked and the tags rejected.
+    """
+    outstanding = set(delivered)
+    acked, rejected = set(), set()
+    for action, tag, multiple in log:
+        settled = {t for t in outstanding if t <= tag} if multiple else {tag}
+        assert settled <= outstanding, f"{action} {tag} settles an unknown delivery"
+        outstanding -= settled
+        if action == "reject":
+            rejected |= settled
+        else:
+            assert settled <= completed, f"ack {tag} settles unfinished deliveries"
+            acked |= settled
+    return acked, rejected
+
+
+async def test_multiple_ack_waits_for_lower_tags():
+    log = []
+    acks = AckBatcher(batch_size=3, interval=0.01)
+    messages = [FakeMessage(tag, log) for tag in range(1, 7)]
+    for message in messages:
+        acks.track(message)
+    
+    # Tag 1 is still running, so the finished ones are acked one by one
+    completed = set()
+    for message in messages[1:4]:
+        await acks.done(message)
+        completed.add(message.delivery_tag)
+    await asyncio.sleep(0.03)
+    assert not any(multiple for _, _, multiple in log)
+    assert replay(log, range(1, 7), completed) == ({2, 3, 4}, set())
+    
+    await acks.done(messages[0])
+    completed.add(1)
+    await acks.reject(messages[4])
+    await acks.done(messages[5])
+    completed.add(6)
+    await asyncio.sleep(0.03)
+    
+    assert replay(log, range(1, 7), completed) == ({1, 2, 3, 4, 6}, {5})
+    assert not acks._in_flight and not acks._done
+
+
+async def test_reset_drops_tags_from_closed_channel():
+    log = []
+    acks = AckBatcher(batch_size=10, interval=0.01)
+    stale = FakeMessage(1, log)
+    acks.track(stale)
+    
+    # Delivery tags restart at 1 on the new channel
+    acks.reset()
+    fresh = FakeMessage(1, log)
+    acks.track(fresh)
+    await acks.done(stale)
+    await acks.done(fresh)
+    await asyncio.sleep(0.03)
+    
+    assert [tag for _, tag, _ in log] == [1]
+    assert not acks._in_flight and not acks._done
+
+
+def retry_death(queue, count):
+    return {"reason": "expired", "queue": queue, "count": count}
+
+
+@pytest.fixture
+def message_queue():
+    return MessageQueue()
+
+
+def test_retry_count_from_x_death(message_queue):
+    retry_queue = f"{message_queue.task_queue_name}.retry.{RETRY_DELAYS[0]}s"
+    headers = {
+        "x-death": [
+            retry_death(retry_queue, 2),
+            retry_death("other.queue", 5),
+            {"reason": "rejected", "queue": retry_queue, "count": 4},
+        ]
+    }
+    
+    assert message_queue._delivery_retry_count(FakeMessage(1, [], headers)) == 2
+
+
+def test_retry_count_header_bounds_lost_x_death(message_queue):
+    assert message_queue._delivery_retry_count(FakeMessage(1, [], {"retry_count": 3})) == 3
+    assert message_queue._delivery_retry_count(FakeMessage(1, [], {"retry_count": "bad"})) == 0
+    assert message_queue._delivery_retry_count(FakeMessage(1, [], None)) == 0
+
+
+def test_decoded_message_carries_delivery_retry_count(message_queue):
+    body = orjson.dumps({
+        "execution_id": "exec",
+        "flow_id": "flow",
+        "node_id": "node",
+        "node_type": "input",
+        "config": {},
+        "inputs": {},
+        "dependencies": [],
+        # A stale body value must not reset the bound
+        "retry_count": 0,
+    })
+    message = FakeMessage(1, [], {"retry_count": 3}, body=body)
+    
+    task_message = message_queue._decode_task_message(message)
+    
+    assert task_message.retry_count == 3
+    assert task_message.retry_count >= task_message.max_retries
@@ -0,0 +1,84 @@
+"""
+Permission cache tests: TTL expiry and invalidation.
+"""
+
+import asyncio
+
+import pytest
+
+from src.models.workspace_permission import PermissionType
+from src.services import permission_cache
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+    
+    def scalars(self):
+        return self
+    
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Answers every permission query with the current rows and counts queries."""
+    
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+    
+    async def execute(self, query):
+        self.queries += 1
+        return FakeResult(list(self.rows))
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    permission_cache._permission_cache.clear()
+    yield
+    permission_cache._permission_cache.clear()
+
+
+async def mask(db, user_id="user-1", workspace_id="ws-1", group_id="group-1"):
+    return await permission_cache.get_permission_mask(user_id, workspace_id, group_id, db=db)
+
+
+async def test_lookup_is_cached():
+    db = FakeSession([PermissionType.MEMBER])
+    
+    first = await mask(db)
+    db.rows = [PermissionType.ADMIN]
+    
+    assert await mask(db) == first
+    assert db.queries == 1
+
+
+async def test_entry_expires_after_ttl(monkeypatch):
+    monkeypatch.setattr(permission_cache.settings, "RBAC_CACHE_TTL", 0.05)
+    db = FakeSession([PermissionType.MEMBER])
+    
+    member = await mask(db)
+    db.rows = [PermissionType.ADMIN]
+    await asyncio.sleep(0.1)
+    
+    assert await mask(db) != member
+    assert db.queries == 2
+
+
+@pytest.mark.parametrize("invalidate, value", [
+    (permission_cache.invalidate_workspace, "ws-1"),
+    (permission_cache.invalidate_user, "user-1"),
+    (permission_cache.invalidate_group, "group-1"),
+])
+async def test_invalidation_drops_matching_entries(invalidate, value):
+    db = FakeSession([PermissionType.MEMBER])
+    member = await mask(db)
+    await mask(db, user_id="user-2", workspace_id="ws-2", group_id="group-2")
+    
+    db.rows = [PermissionType.ADMIN]
+    invalidate(value)
+    
+    assert await mask(db) != member
+    assert await mask(db, user_id="user-2", workspace_id="ws-2", group_id="group-2") == member
+    assert db.queries == 3
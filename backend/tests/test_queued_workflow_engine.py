@@ -0,0 +1,73 @@
+"""
+Queued workflow engine tests: the write-behind DB writer and its fallback.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.core import queued_workflow_engine
+from src.core.message_queue import MessageQueue
+from src.core.queued_workflow_engine import ExecutionUpdate, QueuedWorkflowOrchestrator
+from src.models.execution import ExecutionStatus
+
+
+class FlakyStore:
+    """Stand-in for _write_updates that fails batches and chosen updates."""
+    
+    def __init__(self, poisoned=(), transient=()):
+        self.poisoned = set(poisoned)
+        self.transient = set(transient)
+        self.written = []
+        self.attempts = 0
+    
+    async def __call__(self, batch):
+        self.attempts += 1
+        if len(batch) > 1:
+            raise RuntimeError("batch failed")
+        update = batch[0]
+        if update.execution_id in self.transient:
+            self.transient.discard(update.execution_id)
+            raise RuntimeError("connection reset")
+        if update.execution_id in self.poisoned and update.status == ExecutionStatus.COMPLETED:
+            raise RuntimeError("outputs not serializable")
+        self.written.append((update.execution_id, update.status, update.error_message))
+
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    monkeypatch.setattr(queued_workflow_engine, "DB_WRITE_RETRY_DELAYS", (0, 0))
+    return QueuedWorkflowOrchestrator(MessageQueue())
+
+
+def completed(execution_id):
+    return ExecutionUpdate(execution_id, ExecutionStatus.COMPLETED, datetime.utcnow(), outputs={})
+
+
+async def test_failed_batch_is_written_individually(orchestrator):
+    store = FlakyStore(transient={"exec-2"})
+    orchestrator._write_updates = store
+    
+    for execution_id in ("exec-1", "exec-2", "exec-3"):
+        orchestrator._enqueue_update(completed(execution_id))
+    await orchestrator.close()
+    
+    assert [execution_id for execution_id, _, _ in store.written] == ["exec-1", "exec-2", "exec-3"]
+    assert all(status == ExecutionStatus.COMPLETED for _, status, _ in store.written)
+
+
+async def test_unstorable_outputs_mark_execution_failed(orchestrator):
+    store = FlakyStore(poisoned={"exec-2"})
+    orchestrator._write_updates = store
+    
+    for execution_id in ("exec-1", "exec-2"):
+        orchestrator._enqueue_update(completed(execution_id))
+    await orchestrator.close()
+    
+    written = {execution_id: (status, error) for execution_id, status, error in store.written}
+    assert written["exec-1"] == (ExecutionStatus.COMPLETED, None)
+    status, error = written["exec-2"]
+    assert status == ExecutionStatus.FAILED
+    assert error.startswith("Failed to store execution outputs")
+    # One batch, one write for exec-1, then every retry for exec-2 and the failed write
+    assert store.attempts == 1 + 1 + len(queued_workflow_engine.DB_WRITE_RETRY_DELAYS) + 1 + 1
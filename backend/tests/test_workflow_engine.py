@@ -0,0 +1,118 @@
+"""
+Workflow engine tests: DAG validation and the in-process scheduler.
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.workflow_engine import (
+    DAGAnalyzer,
+    FlowEdge,
+    FlowNode,
+    TaskStatus,
+    WorkflowOrchestrator,
+)
+from src.workers import node_registry
+from src.workers.base_worker import BaseWorker
+
+
+class RecordingWorker(BaseWorker):
+    """Sleeps for config["delay"] and tracks how many calls overlap."""
+    
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+    
+    async def execute(self, config, inputs, context):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(config.get("delay", 0.005))
+        finally:
+            self.running -= 1
+        return {"default": context.node_id}
+
+
+class FailingWorker(BaseWorker):
+    """Fails after config["delay"] seconds."""
+    
+    async def execute(self, config, inputs, context):
+        await asyncio.sleep(config.get("delay", 0))
+        raise RuntimeError("boom")
+
+
+def make_flow(node_types, edges, data=None):
+    nodes = [FlowNode(str(i), node_type, dict(data or {}), {}) for i, node_type in enumerate(node_types)]
+    flow_edges = [FlowEdge(f"e{a}_{b}", str(a), str(b)) for a, b in edges]
+    return nodes, flow_edges
+
+
+@pytest.fixture
+def recording_worker():
+    worker = RecordingWorker()
+    node_registry.register("test_recording", worker)
+    node_registry.register("test_failing", FailingWorker())
+    return worker
+
+
+def test_execution_groups_follow_dependencies():
+    nodes, edges = make_flow(["a"] * 4, [(0, 1), (0, 2), (1, 3), (2, 3)])
+    dag = DAGAnalyzer(nodes, edges)
+    
+    assert dag.get_execution_groups() == [["0"], ["1", "2"], ["3"]]
+    assert dag.topological_sort() == ["0", "1", "2", "3"]
+
+
+def test_cycle_is_rejected():
+    nodes, edges = make_flow(["a"] * 3, [(0, 1), (1, 2), (2, 1)])
+    dag = DAGAnalyzer(nodes, edges)
+    
+    with pytest.raises(ValueError, match="Cycle detected"):
+        dag.topological_sort()
+
+
+async def test_concurrency_limit_is_respected(recording_worker):
+    orchestrator = WorkflowOrchestrator()
+    nodes, edges = make_flow(["test_recording"] * 40, [(0, i) for i in range(1, 40)])
+    dag = DAGAnalyzer(nodes, edges)
+    tasks = orchestrator._create_tasks(nodes, edges, {})
+    limit = orchestrator._get_max_concurrency({"settings": {"max_concurrency": 5}})
+    
+    results = await orchestrator._execute_workflow(tasks, dag, limit)
+    
+    assert limit == 5
+    assert len(results) == 40
+    assert recording_worker.peak == 5
+    assert all(task.status == TaskStatus.COMPLETED for task in tasks.values())
+
+
+async def test_failure_cancels_running_tasks(recording_worker):
+    orchestrator = WorkflowOrchestrator()
+    nodes, edges = make_flow(
+        ["test_failing", "test_recording", "test_recording"], [], {"delay": 5}
+    )
+    nodes[0] = FlowNode("0", "test_failing", {"delay": 0.01}, {})
+    dag = DAGAnalyzer(nodes, edges)
+    tasks = orchestrator._create_tasks(nodes, edges, {})
+    
+    with pytest.raises(RuntimeError, match="boom"):
+        await asyncio.wait_for(orchestrator._execute_workflow(tasks, dag), timeout=2)
+    
+    assert tasks["0"].status == TaskStatus.FAILED
+    assert tasks["1"].status == TaskStatus.SKIPPED
+    assert tasks["2"].status == TaskStatus.SKIPPED
+    assert recording_worker.running == 0
+
+
+async def test_failure_stops_dependents(recording_worker):
+    orchestrator = WorkflowOrchestrator()
+    nodes, edges = make_flow(["test_recording", "test_failing", "test_recording"], [(0, 1), (1, 2)])
+    dag = DAGAnalyzer(nodes, edges)
+    tasks = orchestrator._create_tasks(nodes, edges, {})
+    
+    with pytest.raises(RuntimeError, match="boom"):
+        await orchestrator._execute_workflow(tasks, dag)
+    
+    assert tasks["0"].status == TaskStatus.COMPLETED
+    assert tasks["2"].status == TaskStatus.PENDING